@@ -1,4 +1,4 @@
-from tagreader.clients import IMSClient, list_sources
+from tagreader.clients import AsyncIMSClient, IMSClient, list_sources
 from tagreader.utils import (
     IMSType,
     ReaderType,
@@ -13,6 +13,7 @@ from tagreader.__version__ import version as __version__
 
 __all__ = [
     "IMSClient",
+    "AsyncIMSClient",
     "list_sources",
     "IMSType",
     "ReaderType",
@@ -1,7 +1,16 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone, tzinfo
+from functools import partial
 from itertools import groupby
+from multiprocessing import resource_tracker, shared_memory
 from operator import itemgetter
-from typing import Any, Dict, List, Optional, Tuple, Union
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import numpy as np
@@ -27,6 +36,8 @@ from tagreader.web_handlers import (
 )
 
 NONE_START_TIME = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# Number of intervals for shape preserving reads, unless given to read()
+DEFAULT_PIXELS = 1000
 
 
 def list_sources(
@@ -97,6 +108,16 @@ def get_missing_intervals(
     return missing_intervals
 
 
+def is_server_overloaded(error: Exception) -> bool:
+    """Whether the error means that the server could not answer in time, so
+    that a smaller request may succeed."""
+    if isinstance(error, requests.exceptions.Timeout):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError):
+        return error.response is not None and error.response.status_code >= 500
+    return False
+
+
 def get_next_timeslice(
     start: datetime,
     end: datetime,
@@ -116,6 +137,155 @@ def get_next_timeslice(
     return start, calc_end
 
 
+def get_time_shards(
+    start: datetime,
+    end: datetime,
+    ts: timedelta,
+    max_steps: int,
+) -> List[Tuple[datetime, datetime]]:
+    """Splits the interval from start to end into consecutive time slices of
+    at most max_steps intervals of length ts each."""
+    shards = []
+    while True:
+        shard = get_next_timeslice(start=start, end=end, ts=ts, max_steps=max_steps)
+        shards.append(shard)
+        if shard[1] >= end:
+            break
+        start = shard[1]
+    return shards
+
+
+def assemble_on_grid(
+    frames: List[pd.DataFrame],
+    start: datetime,
+    end: datetime,
+    ts: timedelta,
+    tz: tzinfo,
+) -> Optional[pd.DataFrame]:
+    """Combines frames with timestamps on the grid start + k * ts into one
+    DataFrame, with the same result as pd.concat(frames, axis=1).
+
+    The values are scattered into one preallocated matrix by integer offset
+    along the grid, which avoids aligning the index of every frame. This is
+    only faster than pd.concat() when the indexes differ, as pd.concat()
+    has a fast path for equal indexes. Integer columns stay integers where
+    the frame has no gaps. Returns None if a frame has non-numeric columns
+    or timestamps that are not on the grid, in which case pd.concat() must
+    be used instead.
+    """
+    origin = pd.Timestamp(start).value
+    step = int(ts / timedelta(microseconds=1)) * 1000
+    if step <= 0 or end < start:
+        return None
+    n_rows = (pd.Timestamp(end).value - origin) // step + 1
+    frames = [df for df in frames if len(df.columns) > 0]
+    columns = [column for df in frames for column in df.columns]
+    if not frames or len(set(columns)) != len(columns):
+        return None
+    # Column-major, so that the columns of each frame are written contiguously
+    values = np.full((n_rows, len(columns)), np.nan, order="F")
+    present = np.zeros(n_rows, dtype=bool)
+    # Frames without gaps keep their dtypes, as with pd.concat()
+    dtypes: List[Tuple[int, Dict[str, Any]]] = []
+    i = 0
+    for df in frames:
+        # Cheaper than checking df.dtypes, and object for mixed numeric and
+        # non-numeric columns
+        block = df.to_numpy()
+        if not isinstance(df.index, pd.DatetimeIndex) or block.dtype.kind not in "iuf":
+            return None
+        offsets = (
+            df.index.values.astype("datetime64[ns]", copy=False).view("int64") - origin
+        )
+        positions, remainders = np.divmod(offsets, step)
+        if len(positions) > 0 and (
+            positions[0] < 0
+            or positions[-1] >= n_rows
+            or remainders.any()
+            or (np.diff(positions) <= 0).any()
+        ):
+            return None
+        if len(positions) > 0 and positions[-1] - positions[0] + 1 == len(positions):
+            values[positions[0] : positions[-1] + 1, i : i + len(df.columns)] = block
+            present[positions[0] : positions[-1] + 1] = True
+        else:
+            values[positions, i : i + len(df.columns)] = block
+            present[positions] = True
+        if len(df.columns) > 1:
+            dtypes.append((len(df), dict(df.dtypes)))
+        elif block.dtype != np.float64:
+            dtypes.append((len(df), {df.columns[0]: block.dtype}))
+        i += len(df.columns)
+
+    timestamps = origin + np.flatnonzero(present) * step
+    index = pd.DatetimeIndex(timestamps.astype("datetime64[ns]"), name="time")
+    index = index.tz_localize("UTC").tz_convert(tz)
+    unit = getattr(frames[0].index, "unit", None)
+    if unit is not None:
+        index = index.as_unit(unit)
+    keep = {}
+    for n, frame_dtypes in dtypes:
+        if n == len(index):
+            keep.update(frame_dtypes)
+    data = values[present]
+    if not keep:
+        return pd.DataFrame(data, index=index, columns=columns)
+    # One block per dtype, as DataFrame.astype() goes column by column
+    groups: Dict[Any, List[int]] = {}
+    for j, column in enumerate(columns):
+        groups.setdefault(keep.get(column, values.dtype), []).append(j)
+    return pd.concat(
+        [
+            pd.DataFrame(
+                data[:, positions].astype(dtype),
+                index=index,
+                columns=[columns[j] for j in positions],
+            )
+            for dtype, positions in groups.items()
+        ],
+        axis=1,
+    )[columns]
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into a single call.
+
+    The first caller for a key runs the function, while callers arriving
+    before it completes wait for and share its result. DataFrame results
+    are copied for the waiting callers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Any, Future] = {}
+        self.deduplicated = 0
+
+    def do(self, key: Any, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self.deduplicated += 1
+
+        if not is_leader:
+            result = future.result()
+            return result.copy() if isinstance(result, pd.DataFrame) else result
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+
 def get_handler(
     imstype: Optional[IMSType],
     datasource: str,
@@ -188,6 +358,161 @@ def get_handler(
     )
 
 
+class ReadPlan:
+    """Picklable description of a read of a group of tags.
+
+    Used to read a group of tags in another process, where a new client with
+    its own handler and session is created from the plan.
+    """
+
+    def __init__(
+        self,
+        datasource: str,
+        imstype: IMSType,
+        tz: tzinfo,
+        url: Optional[str],
+        handler_options: Dict[str, Union[int, float, str]],
+        verify_ssl: Optional[Union[bool, str]],
+        auth: Optional[Any],
+        cache_type: Optional[type],
+        cache_directory: Optional[str],
+        tags: List[str],
+        start: datetime,
+        end: datetime,
+        ts: Optional[timedelta],
+        read_type: ReaderType,
+        get_status: bool,
+    ):
+        self.datasource = datasource
+        self.imstype = imstype
+        self.tz = tz
+        self.url = url
+        self.handler_options = handler_options
+        self.verify_ssl = verify_ssl
+        self.auth = auth
+        self.cache_type = cache_type
+        self.cache_directory = cache_directory
+        self.tags = tags
+        self.start = start
+        self.end = end
+        self.ts = ts
+        self.read_type = read_type
+        self.get_status = get_status
+
+    def read(self) -> pd.DataFrame:
+        cache = None
+        if self.cache_type is not None and self.cache_directory is not None:
+            # The on-disk cache is shared by all processes
+            cache = self.cache_type(directory=Path(self.cache_directory))
+        client = IMSClient(
+            datasource=self.datasource,
+            imstype=self.imstype,
+            tz=self.tz,
+            url=self.url,
+            handler_options=self.handler_options,
+            verify_ssl=self.verify_ssl,
+            auth=self.auth,
+            cache=cache,
+        )
+        return client.read(
+            tags=self.tags,
+            start_time=self.start,
+            end_time=self.end,
+            ts=self.ts,
+            read_type=self.read_type,
+            get_status=self.get_status,
+        )
+
+
+def frame_to_shared_memory(df: pd.DataFrame) -> Dict[str, Any]:
+    """Copies a DataFrame with numeric columns and a DatetimeIndex to a new
+    shared memory block, and returns a picklable description of it.
+
+    DataFrames that do not fit this layout are returned as is in the
+    description. So are all DataFrames on Windows, where a block is destroyed
+    when its last handle closes, which happens before the receiver attaches.
+    The receiver must call frame_from_shared_memory(), which releases the
+    block.
+    """
+    if (
+        os.name != "posix"
+        or not isinstance(df.index, pd.DatetimeIndex)
+        or not all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes)
+    ):
+        return {"frame": df}
+    index = df.index.values.astype("datetime64[ns]").view("int64")
+    values = df.to_numpy(dtype=float)
+    size = max(1, index.nbytes + values.nbytes)
+    if sys.version_info >= (3, 13):
+        # The receiving process owns the block and unlinks it
+        block = shared_memory.SharedMemory(create=True, size=size, track=False)
+    else:
+        block = shared_memory.SharedMemory(create=True, size=size)
+        # The receiving process owns the block and unlinks it. POSIX names
+        # are registered with the resource tracker with a leading slash.
+        resource_tracker.unregister(f"/{block.name}", "shared_memory")
+    try:
+        np.ndarray(index.shape, dtype=np.int64, buffer=block.buf)[:] = index
+        np.ndarray(
+            values.shape, dtype=np.float64, buffer=block.buf, offset=index.nbytes
+        )[:] = values
+    finally:
+        block.close()
+    return {
+        "name": block.name,
+        "shape": values.shape,
+        "columns": list(df.columns),
+        "dtypes": list(df.dtypes),
+        "index_name": df.index.name,
+    }
+
+
+def frame_from_shared_memory(description: Dict[str, Any], tz: tzinfo) -> pd.DataFrame:
+    """Rebuilds the DataFrame described by frame_to_shared_memory() and
+    releases the shared memory block."""
+    if "frame" in description:
+        return description["frame"]
+    n_rows, n_columns = description["shape"]
+    block = shared_memory.SharedMemory(name=description["name"])
+    try:
+        index = np.ndarray((n_rows,), dtype=np.int64, buffer=block.buf).copy()
+        values = np.ndarray(
+            (n_rows, n_columns),
+            dtype=np.float64,
+            buffer=block.buf,
+            offset=index.nbytes,
+        ).copy()
+    finally:
+        block.close()
+        block.unlink()
+    df = pd.DataFrame(
+        values,
+        index=pd.DatetimeIndex(index.astype("datetime64[ns]"))
+        .tz_localize("UTC")
+        .tz_convert(tz),
+        columns=description["columns"],
+    )
+    df.index.name = description["index_name"]
+    return df.astype(dict(zip(description["columns"], description["dtypes"])))
+
+
+def release_shared_memory(description: Dict[str, Any]) -> None:
+    """Releases the shared memory block of a description returned by
+    frame_to_shared_memory() without reading it."""
+    if "name" not in description:
+        return
+    try:
+        block = shared_memory.SharedMemory(name=description["name"])
+    except FileNotFoundError:
+        return
+    block.close()
+    block.unlink()
+
+
+def _read_plan_to_shared_memory(plan: ReadPlan) -> Dict[str, Any]:
+    return frame_to_shared_memory(plan.read())
+
+
 class IMSClient:
     def __init__(
         self,
@@ -199,6 +524,8 @@ class IMSClient:
         verify_ssl: Optional[Union[bool, str]] = True,
         auth: Optional[Any] = None,
         cache: Optional[Union[SmartCache, BucketCache]] = None,
+        max_workers: Optional[int] = None,
+        shard_workers: Optional[int] = None,
     ):
         if isinstance(imstype, str):
             try:
@@ -226,6 +553,10 @@ class IMSClient:
             )
 
         self.cache = cache
+        self.max_workers = max_workers
+        self.shard_workers = shard_workers
+        self._cache_lock = threading.Lock()
+        self._single_flight = SingleFlight()
         self.handler = get_handler(
             imstype=imstype,
             datasource=datasource,
@@ -235,6 +566,9 @@ class IMSClient:
             auth=auth,
             cache=self.cache,
         )
+        self._handler_options = handler_options
+        self._verify_ssl = verify_ssl
+        self._auth = auth
 
     def connect(self) -> None:
         self.handler.connect()
@@ -259,12 +593,85 @@ class IMSClient:
             tag=tag, desc=desc, timeout=timeout, return_desc=return_desc
         )
 
+    def iter_search(
+        self,
+        tag: Optional[str] = None,
+        desc: Optional[str] = None,
+        timeout: Optional[int] = None,
+        return_desc: bool = True,
+    ) -> Iterator[Union[Tuple[str, str], str]]:
+        """Yields search results as they arrive from the server, for handlers
+        that return results in pages. See search() for the arguments.
+        """
+        if hasattr(self.handler, "iter_search"):
+            yield from self.handler.iter_search(
+                tag=tag, desc=desc, timeout=timeout, return_desc=return_desc
+            )
+        else:
+            yield from self.search(
+                tag=tag, desc=desc, timeout=timeout, return_desc=return_desc
+            )
+
     def _get_metadata(self, tag: str):
         return self.handler._get_tag_metadata(
             tag
         )  # noqa: Should probably expose this as a public method if needed.
 
-    def _read_single_tag(
+    def _get_cached_data(
+        self,
+        tag: str,
+        start: datetime,
+        end: datetime,
+        ts: timedelta,
+        read_type: ReaderType,
+        get_status: bool,
+        cache: Optional[Union[BucketCache, SmartCache]],
+    ) -> Tuple[pd.DataFrame, List[Tuple[datetime, datetime]]]:
+        """Returns data for a single tag found in the cache, and the
+        intervals that are missing from the cache and need to be read from
+        the server.
+        """
+        df = pd.DataFrame()
+        missing_intervals = [(start, end)]
+        if isinstance(cache, SmartCache):
+            time_slice = get_next_timeslice(start=start, end=end, ts=ts, max_steps=None)
+            df = cache.fetch(
+                tagname=tag,
+                read_type=read_type,
+                ts=ts,
+                start=time_slice[0],
+                end=time_slice[1],
+                get_status=get_status,
+            )
+            missing_intervals = get_missing_intervals(
+                df=df,
+                start=start,
+                end=end,
+                ts=ts,
+                read_type=read_type,
+            )
+        elif isinstance(cache, BucketCache):
+            df = cache.fetch(
+                tagname=tag,
+                read_type=read_type,
+                ts=ts,
+                stepped=False,
+                get_status=get_status,
+                start=start,
+                end=end,
+            )
+            missing_intervals = cache.get_missing_intervals(
+                tagname=tag,
+                read_type=read_type,
+                ts=ts,
+                stepped=False,
+                get_status=get_status,
+                start=start,
+                end=end,
+            )
+        return df, missing_intervals
+
+    def _iter_single_tag(
         self,
         tag: str,
         start: Optional[datetime],
@@ -273,10 +680,16 @@ class IMSClient:
         read_type: ReaderType,
         get_status: bool,
         cache: Optional[Union[BucketCache, SmartCache]],
-    ):
+        shard_workers: Optional[int] = None,
+        pixels: Optional[int] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """Yields data for a single tag as it becomes available: First any
+        data found in the cache, then one DataFrame per request to the server.
+        Data read from the server is stored in the cache before it is yielded.
+        """
         if read_type == ReaderType.SNAPSHOT:
             metadata = self._get_metadata(tag)
-            df = self.handler.read_tag(
+            yield self.handler.read_tag(
                 tag=tag,
                 start=start,
                 end=end,
@@ -285,105 +698,417 @@ class IMSClient:
                 metadata=metadata,
                 get_status=get_status,
             )
+            return
+
+        if read_type == ReaderType.SHAPEPRESERVING:
+            # The server picks the values to return from the whole period, so
+            # these reads are neither cached nor split into pages
+            yield self.handler.read_tag(
+                tag=tag,
+                start=start,
+                end=end,
+                sample_time=ts,
+                read_type=read_type,
+                metadata=self._get_metadata(tag),
+                get_status=get_status,
+                pixels=pixels if pixels is not None else DEFAULT_PIXELS,
+            )
+            return
+
+        df, missing_intervals = self._get_cached_data(
+            tag=tag,
+            start=start,
+            end=end,
+            ts=ts,
+            read_type=read_type,
+            get_status=get_status,
+            cache=cache,
+        )
+        if not df.empty:
+            yield df
+        if not missing_intervals:
+            return
+
+        metadata = self._get_metadata(tag)
+        read_interval = partial(
+            self._read_interval,
+            tag,
+            ts=ts,
+            read_type=read_type,
+            metadata=metadata,
+            get_status=get_status,
+            cache=cache,
+        )
+        if (
+            shard_workers is not None
+            and shard_workers > 1
+            and read_type != ReaderType.RAW
+        ):
+            # Page boundaries are known up front for interpolated and aggregated
+            # data, so the pages can be fetched concurrently.
+            shards = [
+                shard
+                for start, end in missing_intervals
+                for shard in get_time_shards(
+                    start=start, end=end, ts=ts, max_steps=self.handler._max_rows - 1
+                )
+            ]
+            with ThreadPoolExecutor(
+                max_workers=min(shard_workers, len(shards))
+            ) as pool:
+                for frames in pool.map(lambda x: list(read_interval(*x)), shards):
+                    yield from frames
         else:
-            stepped = False
-            missing_intervals = [(start, end)]
-            df = pd.DataFrame()
+            for start, end in missing_intervals:
+                yield from read_interval(start, end)
 
+    def _store_in_cache(
+        self,
+        df: pd.DataFrame,
+        tag: str,
+        start: datetime,
+        end: datetime,
+        ts: timedelta,
+        read_type: ReaderType,
+        get_status: bool,
+        cache: Optional[Union[BucketCache, SmartCache]],
+    ) -> None:
+        if df.empty or read_type == ReaderType.RAW:
+            return
+        # Stores may merge overlapping datasets, so serialize them
+        with self._cache_lock:
             if isinstance(cache, SmartCache):
-                time_slice = get_next_timeslice(
-                    start=start, end=end, ts=ts, max_steps=None
-                )
-                df = cache.fetch(
+                cache.store(
+                    df=df,
                     tagname=tag,
                     read_type=read_type,
                     ts=ts,
-                    start=time_slice[0],
-                    end=time_slice[1],
                     get_status=get_status,
                 )
-                missing_intervals = get_missing_intervals(
+            if isinstance(cache, BucketCache):
+                cache.store(
                     df=df,
-                    start=start,
-                    end=end,
-                    ts=ts,
-                    read_type=read_type,
-                )
-                if not missing_intervals:
-                    return df.tz_convert(self.tz).sort_index()
-            elif isinstance(cache, BucketCache):
-                df = cache.fetch(
                     tagname=tag,
                     read_type=read_type,
                     ts=ts,
-                    stepped=stepped,
+                    stepped=False,
                     get_status=get_status,
                     start=start,
                     end=end,
                 )
-                missing_intervals = cache.get_missing_intervals(
-                    tagname=tag,
-                    read_type=read_type,
-                    ts=ts,
-                    stepped=stepped,
-                    get_status=get_status,
+
+    def _read_interval(
+        self,
+        tag: str,
+        start: datetime,
+        end: datetime,
+        ts: timedelta,
+        read_type: ReaderType,
+        metadata: Dict[str, str],
+        get_status: bool,
+        cache: Optional[Union[BucketCache, SmartCache]],
+    ) -> Iterator[pd.DataFrame]:
+        """Reads a single interval for a tag from the server, one page at a
+        time, and stores each page in the cache before yielding it.
+
+        If the handler uses adaptive paging, the size of each page is chosen
+        from the latency and size of previous responses. Interpolated and
+        aggregated pages are then limited by time rather than row count.
+        """
+        page_size = getattr(self.handler, "page_size", None)
+        while True:
+            if page_size is None:
+                max_rows = self.handler._max_rows
+                page_end = end
+                df = self.handler.read_tag(
+                    tag=tag,
                     start=start,
                     end=end,
+                    sample_time=ts,
+                    read_type=read_type,
+                    metadata=metadata,
+                    get_status=get_status,
                 )
-                if not missing_intervals:
-                    return df.tz_convert(self.tz).sort_index()
-
-            metadata = self._get_metadata(tag)
-            frames = [df]
-            for start, end in missing_intervals:
-                while True:
+            else:
+                max_rows = page_size.get()
+                page_end = end
+                if read_type != ReaderType.RAW:
+                    _, page_end = get_next_timeslice(
+                        start=start, end=end, ts=ts, max_steps=max_rows - 1
+                    )
+                try:
+                    t0 = time.perf_counter()
                     df = self.handler.read_tag(
                         tag=tag,
                         start=start,
-                        end=end,
+                        end=page_end,
                         sample_time=ts,
                         read_type=read_type,
                         metadata=metadata,
                         get_status=get_status,
+                        max_rows=max_rows,
                     )
-                    if not df.empty and read_type != ReaderType.RAW:
-                        if isinstance(cache, SmartCache):
-                            cache.store(
-                                df=df,
-                                tagname=tag,
-                                read_type=read_type,
-                                ts=ts,
-                                get_status=get_status,
-                            )
-                        if isinstance(cache, BucketCache):
-                            cache.store(
-                                df=df,
-                                tagname=tag,
-                                read_type=read_type,
-                                ts=ts,
-                                stepped=stepped,
-                                get_status=get_status,
-                                start=start,
-                                end=end,
-                            )
-                    frames.append(df)
-                    if len(df) < self.handler._max_rows:
-                        break
-                    start = df.index[-1]
-
-            df = pd.concat(frames)
-            # read_type INT leads to overlapping values after concatenating
-            # due to both start time and end time included.
-            # Aggregate read_types (should) align perfectly and don't
-            # (shouldn't) need deduplication.
-            df = df[~df.index.duplicated(keep="first")]  # Deduplicate on index
+                except (
+                    requests.exceptions.Timeout,
+                    requests.exceptions.HTTPError,
+                ) as e:
+                    if not is_server_overloaded(e) or not page_size.shrink():
+                        raise
+                    logger.debug(f"{e} reading {tag}, retrying with fewer rows")
+                    continue
+                page_size.update(
+                    rows=len(df),
+                    max_rows=max_rows,
+                    seconds=time.perf_counter() - t0,
+                    nbytes=self.handler.last_response_bytes,
+                )
+            self._store_in_cache(
+                df=df,
+                tag=tag,
+                start=start,
+                end=page_end,
+                ts=ts,
+                read_type=read_type,
+                get_status=get_status,
+                cache=cache,
+            )
+            yield df
+            # Raw reads continue from the last timestamp, which may hold more
+            # than one value. Other reads continue at the next step, so the
+            # last row is not read again.
+            step = ts if read_type != ReaderType.RAW else timedelta(0)
+            if page_end < end:
+                # Continue from the last timestamp if the server returned
+                # fewer rows than the time window holds.
+                if df.empty or df.index[-1] <= start or df.index[-1] + ts >= page_end:
+                    start = page_end
+                else:
+                    start = df.index[-1] + step
+                continue
+            if len(df) < max_rows or df.index[-1] >= end:
+                break
+            start = df.index[-1] + step
+
+    def _read_single_tag(
+        self,
+        tag: str,
+        start: Optional[datetime],
+        end: Optional[datetime],
+        ts: timedelta,
+        read_type: ReaderType,
+        get_status: bool,
+        cache: Optional[Union[BucketCache, SmartCache]],
+        shard_workers: Optional[int] = None,
+        pixels: Optional[int] = None,
+    ):
+        def read() -> pd.DataFrame:
+            frames = list(
+                self._iter_single_tag(
+                    tag=tag,
+                    start=start,
+                    end=end,
+                    ts=ts,
+                    read_type=read_type,
+                    get_status=get_status,
+                    cache=cache,
+                    shard_workers=shard_workers,
+                    pixels=pixels,
+                )
+            )
+            return self._concat_frames(frames, tag)
+
+        # Identical reads issued concurrently share a single fetch and cache store
+        key = (tag, read_type, ts, get_status, start, end, pixels)
+        return self._single_flight.do(key, read)
+
+    def _concat_frames(self, frames: List[pd.DataFrame], tag: str) -> pd.DataFrame:
+        """Combines the frames read for a single tag into one DataFrame."""
+        df = pd.concat(frames) if frames else pd.DataFrame()
+        if df.empty and not isinstance(df.index, pd.DatetimeIndex):
+            return df
+        # read_type INT leads to overlapping values after concatenating
+        # due to both start time and end time included.
+        # Aggregate read_types (should) align perfectly and don't
+        # (shouldn't) need deduplication.
+        df = df[~df.index.duplicated(keep="first")]  # Deduplicate on index
         df = df.tz_convert(self.tz).sort_index()
         df = df.rename(columns={"value": tag})
         return df
 
+    def _use_multi_tag_reads(self, tags: List[str], read_type: ReaderType) -> bool:
+        """Whether the tags are read together with handler.read_tags()."""
+        return (
+            getattr(self.handler, "_multi_tag_reads", False)
+            and len(tags) > 1
+            and read_type
+            not in [ReaderType.RAW, ReaderType.SNAPSHOT, ReaderType.SHAPEPRESERVING]
+        )
+
+    def _read_multiple_tags(
+        self,
+        tags: List[str],
+        start: datetime,
+        end: datetime,
+        ts: timedelta,
+        read_type: ReaderType,
+        get_status: bool,
+    ) -> List[pd.DataFrame]:
+        """Reads several tags at once, using handler.read_tags().
+
+        Tags that miss the same intervals in the cache are read together,
+        one page of at most max_rows rows per tag at a time. The handler
+        splits each page further where the server caps the number of points
+        per response, so pages are returned in full.
+        """
+        frames: Dict[str, List[pd.DataFrame]] = {tag: [] for tag in tags}
+        groups: Dict[Tuple[Tuple[datetime, datetime], ...], List[str]] = {}
+        for tag in tags:
+            df, missing_intervals = self._get_cached_data(
+                tag=tag,
+                start=start,
+                end=end,
+                ts=ts,
+                read_type=read_type,
+                get_status=get_status,
+                cache=self.cache,
+            )
+            if not df.empty:
+                frames[tag].append(df)
+            if missing_intervals:
+                key = tuple(tuple(interval) for interval in missing_intervals)
+                groups.setdefault(key, []).append(tag)
+
+        for missing_intervals, group in groups.items():
+            for interval_start, interval_end in missing_intervals:
+                for page_start, page_end in get_time_shards(
+                    start=interval_start,
+                    end=interval_end,
+                    ts=ts,
+                    max_steps=self.handler._max_rows - 1,
+                ):
+                    pages = self.handler.read_tags(
+                        tags=group,
+                        start=page_start,
+                        end=page_end,
+                        sample_time=ts,
+                        read_type=read_type,
+                        get_status=get_status,
+                    )
+                    for tag, df in pages.items():
+                        self._store_in_cache(
+                            df=df,
+                            tag=tag,
+                            start=page_start,
+                            end=page_end,
+                            ts=ts,
+                            read_type=read_type,
+                            get_status=get_status,
+                            cache=self.cache,
+                        )
+                        frames[tag].append(df)
+
+        return [self._concat_frames(frames[tag], tag) for tag in tags]
+
+    def _read_summaries(
+        self,
+        tag: str,
+        start: datetime,
+        end: datetime,
+        ts: timedelta,
+        read_types: List[ReaderType],
+        get_status: bool,
+    ) -> Dict[ReaderType, pd.DataFrame]:
+        """Reads several aggregates for a single tag. Summary types supported
+        by handler.read_tag_summaries() that miss the same intervals in the
+        cache are read together, the rest one at a time.
+        """
+        read_together = [
+            read_type
+            for read_type in read_types
+            if hasattr(self.handler, "read_tag_summaries")
+            and self.handler._is_summary(read_type)
+        ]
+        frames: Dict[ReaderType, List[pd.DataFrame]] = {
+            read_type: [] for read_type in read_together
+        }
+        groups: Dict[Tuple[Tuple[datetime, datetime], ...], List[ReaderType]] = {}
+        for read_type in read_together:
+            df, missing_intervals = self._get_cached_data(
+                tag=tag,
+                start=start,
+                end=end,
+                ts=ts,
+                read_type=read_type,
+                get_status=get_status,
+                cache=self.cache,
+            )
+            if not df.empty:
+                frames[read_type].append(df)
+            if missing_intervals:
+                key = tuple(tuple(interval) for interval in missing_intervals)
+                groups.setdefault(key, []).append(read_type)
+
+        for missing_intervals, group in groups.items():
+            for interval_start, interval_end in missing_intervals:
+                # Each summary type adds one row per step to the response
+                for page_start, page_end in get_time_shards(
+                    start=interval_start,
+                    end=interval_end,
+                    ts=ts,
+                    max_steps=max(1, self.handler._max_rows // len(group) - 1),
+                ):
+                    pages = self.handler.read_tag_summaries(
+                        tag=tag,
+                        start=page_start,
+                        end=page_end,
+                        sample_time=ts,
+                        read_types=group,
+                        get_status=get_status,
+                    )
+                    for read_type, df in pages.items():
+                        self._store_in_cache(
+                            df=df,
+                            tag=tag,
+                            start=page_start,
+                            end=page_end,
+                            ts=ts,
+                            read_type=read_type,
+                            get_status=get_status,
+                            cache=self.cache,
+                        )
+                        frames[read_type].append(df)
+
+        results = {}
+        for read_type in read_types:
+            if read_type in frames:
+                results[read_type] = self._concat_frames(frames[read_type], tag)
+            else:
+                results[read_type] = self._read_single_tag(
+                    tag=tag,
+                    start=start,
+                    end=end,
+                    ts=ts,
+                    read_type=read_type,
+                    get_status=get_status,
+                    cache=self.cache,
+                )
+        return results
+
+    @property
+    def coalesced_reads(self) -> int:
+        """Number of reads that were served by an identical read in flight."""
+        return self._single_flight.deduplicated
+
+    def _resolve_tags(self, tags: List[str]) -> None:
+        """Looks up the identifiers of all tags at once, for handlers that
+        support it, instead of one tag at a time as they are read."""
+        if len(tags) > 1 and hasattr(self.handler, "tags_to_web_ids"):
+            self.handler.tags_to_web_ids(tags)
+
     def get_units(self, tags: Union[str, List[str]]):
         if isinstance(tags, str):
             tags = [tags]
+        self._resolve_tags(tags)
         units = {}
         for tag in tags:
             try:
@@ -405,6 +1130,7 @@ class IMSClient:
     def get_descriptions(self, tags: Union[str, List[str]]) -> Dict[str, str]:
         if isinstance(tags, str):
             tags = [tags]
+        self._resolve_tags(tags)
         descriptions = {}
         for tag in tags:
             try:
@@ -449,30 +1175,15 @@ class IMSClient:
             get_status=get_status,
         )
 
-    def read(
+    def _prepare_read(
         self,
         tags: Union[str, List[str]],
-        start_time: Optional[Union[datetime, pd.Timestamp, str]] = None,
-        end_time: Optional[Union[datetime, pd.Timestamp, str]] = None,
-        ts: Optional[Union[timedelta, pd.Timedelta, int]] = timedelta(seconds=60),
-        read_type: ReaderType = ReaderType.INT,
-        get_status: bool = False,
-    ) -> pd.DataFrame:
-        """Reads values for the specified [tags] from the IMS server for the
-        time interval from [start_time] to [stop_time] in intervals [ts].
-
-        The interval [ts] can be specified as pd.Timedelta or as an integer,
-        in which case it will be interpreted as seconds.
-
-        Default value for [read_type] is ReaderType.INT, which interpolates
-        the raw data.
-        All possible values for read_type are defined in the ReaderType class,
-        which can be imported as follows:
-            from utils import ReaderType
-
-        Values for ReaderType.* that should work for all handlers are:
-            INT, RAW, MIN, MAX, RNG, AVG, VAR, STD and SNAPSHOT
-        """
+        start_time: Optional[Union[datetime, pd.Timestamp, str]],
+        end_time: Optional[Union[datetime, pd.Timestamp, str]],
+        ts: Optional[Union[timedelta, pd.Timedelta, int]],
+        read_type: ReaderType,
+    ) -> Tuple[List[str], datetime, datetime, Optional[timedelta], ReaderType]:
+        """Validates and normalizes the arguments given to read()."""
         start = start_time
         end = end_time
         if isinstance(tags, str):
@@ -484,11 +1195,16 @@ class IMSClient:
                 ValueError(
                     "read_type needs to be of type ReaderType.* or a legal value. Please refer to the docstring."
                 )
-        if read_type in [ReaderType.RAW, ReaderType.SNAPSHOT] and len(tags) > 1:
+        if read_type == ReaderType.RAW and len(tags) > 1:
             raise RuntimeError(
                 "Unable to read raw/sampled data for multiple tags since they don't "
                 "share time vector. Read one at a time."
             )
+        if read_type == ReaderType.SNAPSHOT and len(tags) > 1:
+            raise RuntimeError(
+                "Unable to read snapshots of multiple tags with read() since they "
+                "don't share time vector. Use read_snapshots() instead."
+            )
 
         if isinstance(tags, str):
             tags = [tags]
@@ -521,13 +1237,17 @@ class IMSClient:
             ),
         ):
             ts = timedelta(seconds=int(ts))
-        elif not ts and read_type not in [ReaderType.SNAPSHOT, ReaderType.RAW]:
+        elif not ts and read_type not in [
+            ReaderType.SNAPSHOT,
+            ReaderType.RAW,
+            ReaderType.SHAPEPRESERVING,
+        ]:
             raise ValueError(
                 "ts needs to be a timedelta or an integer (number of seconds)"
-                " unless you are reading raw or snapshot data."
+                " unless you are reading raw, shape preserving or snapshot data."
                 f" Given type: {type(ts)}"
             )
-        elif not isinstance(ts, timedelta):
+        elif ts is not None and not isinstance(ts, timedelta):
             raise ValueError(
                 "ts needs to be either a None, timedelta or and integer (number of seconds)."
                 f" Given type: {type(ts)}"
@@ -546,21 +1266,479 @@ class IMSClient:
                 f"Duplicate tags found, removed duplicates: {', '.join(duplicates)}"
             )
 
-        results = []
-        for i, tag in enumerate(tags):
-            results.append(
-                self._read_single_tag(
-                    tag=tag,
-                    start=start,
-                    end=end,
-                    ts=ts,
+        return tags, start, end, ts, read_type
+
+    def read(
+        self,
+        tags: Union[str, List[str]],
+        start_time: Optional[Union[datetime, pd.Timestamp, str]] = None,
+        end_time: Optional[Union[datetime, pd.Timestamp, str]] = None,
+        ts: Optional[Union[timedelta, pd.Timedelta, int]] = timedelta(seconds=60),
+        read_type: ReaderType = ReaderType.INT,
+        get_status: bool = False,
+        max_workers: Optional[int] = None,
+        shard_workers: Optional[int] = None,
+        max_processes: Optional[int] = None,
+        pixels: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Reads values for the specified [tags] from the IMS server for the
+        time interval from [start_time] to [stop_time] in intervals [ts].
+
+        The interval [ts] can be specified as pd.Timedelta or as an integer,
+        in which case it will be interpreted as seconds.
+
+        If [max_workers] (or the client's max_workers) is larger than one,
+        tags are read concurrently using a pool of at most [max_workers]
+        threads. The returned DataFrame is identical to a sequential read.
+        Similarly, if [shard_workers] is larger than one, long interpolated
+        and aggregated reads are split into pages of at most max_rows rows
+        that are fetched concurrently for each tag.
+
+        If [max_processes] is larger than one, the tags are split into groups
+        that are read in a pool of processes. Each process creates its own
+        handler, and shares the on-disk cache. This helps when parsing the
+        responses, rather than waiting for the server, limits the read speed.
+        On POSIX systems, the results are passed back in shared memory.
+
+        For ReaderType.SHAPEPRESERVING, the server divides the period into
+        [pixels] intervals (default 1000), and returns the values needed to
+        draw the shape of the trend within each. [ts] is ignored.
+
+        Default value for [read_type] is ReaderType.INT, which interpolates
+        the raw data.
+        All possible values for read_type are defined in the ReaderType class,
+        which can be imported as follows:
+            from utils import ReaderType
+
+        Values for ReaderType.* that should work for all handlers are:
+            INT, RAW, MIN, MAX, RNG, AVG, VAR, STD and SNAPSHOT
+        """
+        tags, start, end, ts, read_type = self._prepare_read(
+            tags=tags,
+            start_time=start_time,
+            end_time=end_time,
+            ts=ts,
+            read_type=read_type,
+        )
+
+        if (
+            max_processes is not None
+            and max_processes > 1
+            and len(tags) > 1
+            and read_type != ReaderType.SHAPEPRESERVING
+        ):
+            return self._read_in_processes(
+                tags=tags,
+                start=start,
+                end=end,
+                ts=ts,
+                read_type=read_type,
+                get_status=get_status,
+                max_processes=max_processes,
+            )
+
+        if self._use_multi_tag_reads(tags, read_type):
+            results = self._read_multiple_tags(
+                tags=tags,
+                start=start,
+                end=end,
+                ts=ts,
+                read_type=read_type,
+                get_status=get_status,
+            )
+            return self._combine_results(
+                results,
+                start=start,
+                end=end,
+                ts=ts,
+                read_type=read_type,
+                get_status=get_status,
+            )
+
+        if max_workers is None:
+            max_workers = self.max_workers
+        if shard_workers is None:
+            shard_workers = self.shard_workers
+
+        self._resolve_tags(tags)
+        read_single_tag = partial(
+            self._read_single_tag,
+            start=start,
+            end=end,
+            ts=ts,
+            read_type=read_type,
+            get_status=get_status,
+            cache=self.cache,
+            shard_workers=shard_workers,
+            pixels=pixels,
+        )
+        if max_workers is not None and max_workers > 1 and len(tags) > 1:
+            # Executor.map returns results in the order of the input tags
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(tags))) as pool:
+                results = list(pool.map(read_single_tag, tags))
+        else:
+            results = [read_single_tag(tag) for tag in tags]
+
+        return self._combine_results(
+            results,
+            start=start,
+            end=end,
+            ts=ts,
+            read_type=read_type,
+            get_status=get_status,
+        )
+
+    def read_multi(
+        self,
+        tags: Union[str, List[str]],
+        start_time: Optional[Union[datetime, pd.Timestamp, str]] = None,
+        end_time: Optional[Union[datetime, pd.Timestamp, str]] = None,
+        ts: Optional[Union[timedelta, pd.Timedelta, int]] = timedelta(seconds=60),
+        read_types: Optional[List[Union[ReaderType, str]]] = None,
+        get_status: bool = False,
+    ) -> pd.DataFrame:
+        """Reads several aggregates of the tags over the same period.
+
+        Handlers that support it fetch all summary types of a tag in a single
+        request. Each read type is cached separately, just as if it was read
+        with read().
+
+        Returns a DataFrame with one column per (tag, read type), where the
+        read type is given by name, e.g. ("tag", "AVG").
+        """
+        if not read_types:
+            raise ValueError("At least one read type is required.")
+        read_types = [
+            getattr(ReaderType, read_type) if isinstance(read_type, str) else read_type
+            for read_type in read_types
+        ]
+        for read_type in read_types:
+            if read_type in [
+                ReaderType.RAW,
+                ReaderType.SNAPSHOT,
+                ReaderType.SHAPEPRESERVING,
+            ]:
+                raise ValueError(
+                    f"read_multi() does not support {read_type.name}, which does "
+                    "not share time vector with the aggregates."
+                )
+        tags, start, end, ts, _ = self._prepare_read(
+            tags=tags,
+            start_time=start_time,
+            end_time=end_time,
+            ts=ts,
+            read_type=read_types[0],
+        )
+        read_types = list(dict.fromkeys(read_types))
+
+        frames = []
+        for tag in tags:
+            results = self._read_summaries(
+                tag=tag,
+                start=start,
+                end=end,
+                ts=ts,
+                read_types=read_types,
+                get_status=get_status,
+            )
+            for read_type, df in results.items():
+                if len(df.columns) == 0:
+                    continue
+                df.columns = pd.MultiIndex.from_tuples(
+                    [(column, read_type.name) for column in df.columns]
+                )
+                frames.append(df)
+        return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+
+    def read_snapshots(
+        self,
+        tags: Union[str, List[str]],
+        end_time: Optional[Union[datetime, pd.Timestamp, str]] = None,
+        get_status: bool = False,
+    ) -> pd.DataFrame:
+        """Reads the last recorded value of the [tags], or the value at
+        [end_time] if given. Handlers that support it read the snapshots of
+        several tags per request.
+
+        Returns a DataFrame indexed by tag, with one row per tag and the
+        columns time, value and, if get_status is True, status. The layout is
+        the same for any number of tags.
+        """
+        if isinstance(tags, str):
+            tags = [tags]
+        tags = list(dict.fromkeys(tags))
+        end = end_time
+        if end is None:
+            end = datetime.now(timezone.utc)
+        elif isinstance(end, (str, pd.Timestamp)):
+            end = convert_to_pydatetime(end)
+        end = ensure_datetime_with_tz(end, tz=self.tz)
+        return self._read_snapshots(tags=tags, end=end, get_status=get_status)
+
+    def _read_snapshots(
+        self, tags: List[str], end: Optional[datetime], get_status: bool
+    ) -> pd.DataFrame:
+        """Reads the snapshot of several tags, using handler.read_tags() where
+        available.
+
+        Returns a DataFrame with one row per tag, and the columns time, value
+        and, if get_status is True, status.
+        """
+        if hasattr(self.handler, "read_tags"):
+            frames = self.handler.read_tags(
+                tags=tags,
+                start=None,
+                end=end,
+                sample_time=None,
+                read_type=ReaderType.SNAPSHOT,
+                get_status=get_status,
+            )
+        else:
+            frames = {
+                tag: self.handler.read_tag(
+                    tag=tag,
+                    start=None,
+                    end=end,
+                    sample_time=None,
+                    read_type=ReaderType.SNAPSHOT,
+                    metadata=self._get_metadata(tag),
+                    get_status=get_status,
+                )
+                for tag in tags
+            }
+
+        rows = []
+        for tag in tags:
+            df = frames.get(tag, pd.DataFrame())
+            row: Dict[str, Any] = {"time": pd.NaT, "value": np.nan}
+            if get_status:
+                row["status"] = np.nan
+            if not df.empty:
+                row["time"] = df.index[0].tz_convert(self.tz)
+                row["value"] = df[tag].iloc[0]
+                if get_status:
+                    row["status"] = df[f"{tag}::status"].iloc[0]
+            rows.append(row)
+        return pd.DataFrame(rows, index=pd.Index(tags, name="tag"))
+
+    def _read_in_processes(
+        self,
+        tags: List[str],
+        start: datetime,
+        end: datetime,
+        ts: Optional[timedelta],
+        read_type: ReaderType,
+        get_status: bool,
+        max_processes: int,
+    ) -> pd.DataFrame:
+        imstype = (
+            IMSType.PIWEBAPI
+            if isinstance(self.handler, PIHandlerWeb)
+            else IMSType.ASPENONE
+        )
+        plans = [
+            ReadPlan(
+                datasource=self.handler.datasource,
+                imstype=imstype,
+                tz=self.tz,
+                url=self.handler.base_url,
+                handler_options=self._handler_options,
+                verify_ssl=self._verify_ssl,
+                auth=self._auth,
+                cache_type=type(self.cache) if self.cache is not None else None,
+                cache_directory=(
+                    self.cache.directory if self.cache is not None else None
+                ),
+                tags=list(group),
+                start=start,
+                end=end,
+                ts=ts,
+                read_type=read_type,
+                get_status=get_status,
+            )
+            for group in np.array_split(np.array(tags, dtype=object), max_processes)
+            if len(group) > 0
+        ]
+        with ProcessPoolExecutor(max_workers=len(plans)) as pool:
+            futures = [pool.submit(_read_plan_to_shared_memory, plan) for plan in plans]
+        # All plans have finished once the pool has shut down. Blocks created by
+        # successful plans are released even if another plan failed.
+        descriptions = [f.result() for f in futures if f.exception() is None]
+        results = []
+        try:
+            for future in futures:
+                error = future.exception()
+                if error is not None:
+                    raise error
+            while descriptions:
+                results.append(
+                    frame_from_shared_memory(descriptions.pop(0), tz=self.tz)
+                )
+        finally:
+            for description in descriptions:
+                release_shared_memory(description)
+        return self._combine_results(
+            results,
+            start=start,
+            end=end,
+            ts=ts,
+            read_type=read_type,
+            get_status=get_status,
+        )
+
+    def _combine_results(
+        self,
+        results: List[pd.DataFrame],
+        start: datetime,
+        end: datetime,
+        ts: Optional[timedelta],
+        read_type: ReaderType,
+        get_status: bool,
+    ) -> pd.DataFrame:
+        """Combines the DataFrames read for each tag into one DataFrame."""
+        if (
+            len(results) > 1
+            and not get_status
+            and not all(df.index.equals(results[0].index) for df in results[1:])
+            and read_type
+            not in [ReaderType.RAW, ReaderType.SNAPSHOT, ReaderType.SHAPEPRESERVING]
+        ):
+            # The tags share a time grid but not the same index, so skip
+            # index alignment
+            df = assemble_on_grid(results, start=start, end=end, ts=ts, tz=self.tz)
+            if df is not None:
+                return df
+
+        return pd.concat(results, axis=1)
+
+    def iter_read(
+        self,
+        tags: Union[str, List[str]],
+        start_time: Optional[Union[datetime, pd.Timestamp, str]] = None,
+        end_time: Optional[Union[datetime, pd.Timestamp, str]] = None,
+        ts: Optional[Union[timedelta, pd.Timedelta, int]] = timedelta(seconds=60),
+        read_type: ReaderType = ReaderType.INT,
+        get_status: bool = False,
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """Reads the same data as read(), but yields (tag, DataFrame) chunks
+        as they are read instead of returning one combined DataFrame.
+
+        Tags are read one at a time in the given order. For each tag, data
+        found in the cache is yielded first, followed by one chunk per
+        request to the server. The cache is filled as chunks are read, so
+        only one chunk needs to be held in memory at a time.
+        """
+        tags, start, end, ts, read_type = self._prepare_read(
+            tags=tags,
+            start_time=start_time,
+            end_time=end_time,
+            ts=ts,
+            read_type=read_type,
+        )
+        for tag in tags:
+            last_timestamp = None
+            for df in self._iter_single_tag(
+                tag=tag,
+                start=start,
+                end=end,
+                ts=ts,
+                read_type=read_type,
+                get_status=get_status,
+                cache=self.cache,
+            ):
+                # Consecutive pages from the server share the boundary timestamp
+                if last_timestamp is not None:
+                    df = df[df.index != last_timestamp]
+                if df.empty:
+                    continue
+                last_timestamp = df.index[-1]
+                df = df.tz_convert(self.tz).rename(columns={"value": tag})
+                yield tag, df
+
+    def plan_read(
+        self,
+        tags: Union[str, List[str]],
+        start_time: Optional[Union[datetime, pd.Timestamp, str]] = None,
+        end_time: Optional[Union[datetime, pd.Timestamp, str]] = None,
+        ts: Optional[Union[timedelta, pd.Timedelta, int]] = timedelta(seconds=60),
+        read_type: ReaderType = ReaderType.INT,
+        get_status: bool = False,
+    ) -> pd.DataFrame:
+        """Estimates the cost of calling read() with the same arguments,
+        without reading any data from the server.
+
+        The cache is inspected the same way as in read(). Returns a DataFrame
+        indexed by tag with the columns:
+            missing_intervals: Intervals that are not found in the cache.
+            cached_rows: Number of rows found in the cache.
+            requests: Number of requests needed to read the missing intervals.
+            rows: Expected number of rows to read from the server.
+            bytes: Rough estimate of the size of the server responses.
+
+        The number of rows for RAW and SHAPEPRESERVING reads depends on the
+        data, and is returned as NaN. For these, requests is the minimum
+        number of requests.
+        """
+        tags, start, end, ts, read_type = self._prepare_read(
+            tags=tags,
+            start_time=start_time,
+            end_time=end_time,
+            ts=ts,
+            read_type=read_type,
+        )
+        page_size = getattr(self.handler, "page_size", None)
+        max_rows = page_size.get() if page_size else self.handler._max_rows
+        bytes_per_row = self.handler._bytes_per_row * (2 if get_status else 1)
+        plan = []
+        for tag in tags:
+            if read_type == ReaderType.SNAPSHOT:
+                df, missing_intervals = pd.DataFrame(), [(start, end)]
+            else:
+                df, missing_intervals = self._get_cached_data(
+                    tag=tag,
+                    start=start,
+                    end=end,
+                    ts=ts,
                     read_type=read_type,
                     get_status=get_status,
                     cache=self.cache,
                 )
+            requests, rows = 0, 0.0
+            for interval_start, interval_end in missing_intervals:
+                if read_type == ReaderType.SNAPSHOT:
+                    requests, rows = requests + 1, rows + 1
+                elif read_type in [ReaderType.RAW, ReaderType.SHAPEPRESERVING]:
+                    requests, rows = requests + 1, np.nan
+                else:
+                    steps = int(np.ceil((interval_end - interval_start) / ts))
+                    requests += max(1, int(np.ceil(steps / (max_rows - 1))))
+                    # Interpolated reads include both start and end
+                    rows += steps + (read_type == ReaderType.INT)
+            plan.append(
+                {
+                    "tag": tag,
+                    "missing_intervals": missing_intervals,
+                    "cached_rows": len(df),
+                    "requests": requests,
+                    "rows": rows,
+                    "bytes": rows * bytes_per_row,
+                }
             )
+        return pd.DataFrame(plan).set_index("tag")
 
-        return pd.concat(results, axis=1)
+    def subscribe(
+        self, tags: Union[str, List[str]], get_status: bool = False
+    ) -> "UpdateSubscription":
+        """Registers the tags for updates. Call poll() on the returned
+        subscription to get the values recorded since the previous poll.
+        """
+        if not hasattr(self.handler, "register_updates"):
+            raise NotImplementedError(
+                f"Updates are not supported for {type(self.handler).__name__}"
+            )
+        if isinstance(tags, str):
+            tags = [tags]
+        return UpdateSubscription(client=self, tags=tags, get_status=get_status)
 
     def query_sql(self, query: str, parse: bool = True):
         """[summary]
@@ -573,3 +1751,191 @@ class IMSClient:
         """
         df_or_cursor = self.handler.query_sql(query=query, parse=parse)
         return df_or_cursor
+
+
+class UpdateSubscription:
+    """Tails a set of tags using the stream updates of the handler.
+
+    Each call to poll() returns the RAW values recorded since the previous
+    call. Tags whose updates expire are registered again, which may leave a
+    gap in the values. Updates arrive in the order the server receives them,
+    often late, so they say nothing about which periods are complete and are
+    not stored in the cache of the client.
+    """
+
+    def __init__(self, client: IMSClient, tags: List[str], get_status: bool):
+        self.client = client
+        self.tags = tags
+        self.get_status = get_status
+        self.markers = client.handler.register_updates(tags)
+
+    def poll(self) -> pd.DataFrame:
+        handler = self.client.handler
+        frames, markers = handler.get_updates(self.markers, get_status=self.get_status)
+        expired = [tag for tag in self.tags if tag not in markers]
+        if expired:
+            markers.update(handler.register_updates(expired))
+        self.markers = markers
+
+        results = [
+            self.client._concat_frames([frames[tag]], tag)
+            for tag in self.tags
+            if tag in frames and not frames[tag].empty
+        ]
+        return pd.concat(results, axis=1) if results else pd.DataFrame()
+
+
+class AsyncIMSClient:
+    """Asyncio interface with the same methods as IMSClient.
+
+    The client wraps an IMSClient and uses its handler, query builders and
+    parsers. The handlers use blocking HTTP calls, so this is a thread-backed
+    wrapper: each call runs in a pool of [max_concurrency] worker threads
+    owned by the client, which bounds the number of requests in flight.
+    Calls beyond that wait in the pool's queue without blocking the event
+    loop. The client can be used from several event loops, one at a time.
+    """
+
+    def __init__(
+        self,
+        datasource: str,
+        imstype: Optional[Union[str, IMSType]] = None,
+        tz: Optional[Union[tzinfo, str]] = None,
+        url: Optional[str] = None,
+        handler_options: Dict[str, Union[int, float, str]] = {},  # noqa:
+        verify_ssl: Optional[Union[bool, str]] = True,
+        auth: Optional[Any] = None,
+        cache: Optional[Union[SmartCache, BucketCache]] = None,
+        max_concurrency: int = 10,
+    ):
+        self.client = IMSClient(
+            datasource=datasource,
+            imstype=imstype,
+            tz=tz,
+            url=url,
+            handler_options=handler_options,
+            verify_ssl=verify_ssl,
+            auth=auth,
+            cache=cache,
+        )
+        self.max_concurrency = max_concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="tagreader"
+        )
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    def close(self) -> None:
+        """Stops the worker threads once the calls in flight have finished."""
+        self._executor.shutdown(wait=False)
+
+    async def connect(self) -> None:
+        await self._run(self.client.connect)
+
+    async def search(
+        self,
+        tag: Optional[str] = None,
+        desc: Optional[str] = None,
+        timeout: Optional[int] = None,
+        return_desc: bool = True,
+    ) -> Union[List[Tuple[str, str]], List[str]]:
+        return await self._run(
+            self.client.search,
+            tag=tag,
+            desc=desc,
+            timeout=timeout,
+            return_desc=return_desc,
+        )
+
+    async def get_units(self, tags: Union[str, List[str]]) -> Dict[str, str]:
+        # A single call, so that the identifiers of all tags are looked up at once
+        return await self._run(self.client.get_units, tags)
+
+    async def get_descriptions(self, tags: Union[str, List[str]]) -> Dict[str, str]:
+        return await self._run(self.client.get_descriptions, tags)
+
+    async def read_snapshots(
+        self,
+        tags: Union[str, List[str]],
+        end_time: Optional[Union[datetime, pd.Timestamp, str]] = None,
+        get_status: bool = False,
+    ) -> pd.DataFrame:
+        """Asynchronous version of IMSClient.read_snapshots()."""
+        return await self._run(
+            self.client.read_snapshots,
+            tags=tags,
+            end_time=end_time,
+            get_status=get_status,
+        )
+
+    async def read(
+        self,
+        tags: Union[str, List[str]],
+        start_time: Optional[Union[datetime, pd.Timestamp, str]] = None,
+        end_time: Optional[Union[datetime, pd.Timestamp, str]] = None,
+        ts: Optional[Union[timedelta, pd.Timedelta, int]] = timedelta(seconds=60),
+        read_type: ReaderType = ReaderType.INT,
+        get_status: bool = False,
+        pixels: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Asynchronous version of IMSClient.read(). See IMSClient.read() for
+        a description of the arguments.
+
+        Tags are read one call per tag, after looking up the identifiers of
+        all tags at once, unless the handler reads several tags per request,
+        in which case all tags are read in a single call.
+        """
+        tags, start, end, ts, read_type = self.client._prepare_read(
+            tags=tags,
+            start_time=start_time,
+            end_time=end_time,
+            ts=ts,
+            read_type=read_type,
+        )
+        if self.client._use_multi_tag_reads(tags, read_type):
+            results = await self._run(
+                self.client._read_multiple_tags,
+                tags=tags,
+                start=start,
+                end=end,
+                ts=ts,
+                read_type=read_type,
+                get_status=get_status,
+            )
+            return self.client._combine_results(
+                results,
+                start=start,
+                end=end,
+                ts=ts,
+                read_type=read_type,
+                get_status=get_status,
+            )
+        await self._run(self.client._resolve_tags, tags)
+        results = await asyncio.gather(
+            *[
+                self._run(
+                    self.client._read_single_tag,
+                    tag=tag,
+                    start=start,
+                    end=end,
+                    ts=ts,
+                    read_type=read_type,
+                    get_status=get_status,
+                    cache=self.client.cache,
+                    pixels=pixels,
+                )
+                for tag in tags
+            ]
+        )
+        return self.client._combine_results(
+            list(results),
+            start=start,
+            end=end,
+            ts=ts,
+            read_type=read_type,
+            get_status=get_status,
+        )
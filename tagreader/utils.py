@@ -6,10 +6,11 @@ import ssl
 from datetime import datetime, timezone, tzinfo
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Union
+from typing import Iterable, Optional, Union
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import certifi
+import numpy as np
 import pandas as pd
 import requests
 from platformdirs import user_data_dir
@@ -72,6 +73,24 @@ def ensure_datetime_with_tz(
     return date_stamp
 
 
+def parse_utc_timestamps(timestamps: Iterable[str]) -> pd.DatetimeIndex:
+    """Converts ISO 8601 timestamps in UTC, as returned by PI Web API, to a
+    DatetimeIndex.
+
+    Timestamps on the form 2020-04-01T09:05:00Z, with or without fractional
+    seconds, also mixed, are converted by NumPy in one pass. Other formats
+    fall back to pandas.
+    """
+    values = np.asarray(timestamps, dtype=str)
+    if values.size > 0 and np.char.endswith(values, "Z").all():
+        try:
+            nanoseconds = np.char.rstrip(values, "Z").astype("datetime64[ns]")
+            return pd.DatetimeIndex(nanoseconds).tz_localize("UTC")
+        except ValueError:
+            pass
+    return pd.DatetimeIndex(pd.to_datetime(values, format="ISO8601", utc=True))
+
+
 def urljoin(*args) -> str:
     """
     Joins components of URL. Ensures slashes are inserted or removed where
@@ -1,12 +1,15 @@
+import base64
 import hashlib
 import json
 import re
+import threading
 import urllib.parse
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from hashlib import new as hashlib_new_method
 from json.decoder import JSONDecodeError
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -16,9 +19,20 @@ from Crypto.Hash import MD4 as _MD4
 from requests_kerberos import OPTIONAL, HTTPKerberosAuth
 from urllib3.exceptions import InsecureRequestWarning
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from tagreader.cache import BucketCache, SmartCache
 from tagreader.logger import logger
-from tagreader.utils import ReaderType, is_mac, is_windows, urljoin
+from tagreader.utils import (
+    ReaderType,
+    is_mac,
+    is_windows,
+    parse_utc_timestamps,
+    urljoin,
+)
 
 
 class MD4:
@@ -174,7 +188,109 @@ def get_piwebapi_source_to_webid_dict(
         logger.error(f"Could not decode JSON response: {e}")
 
 
+class AdaptivePageSize:
+    """Tunes the number of rows to request per page from observed responses.
+
+    The page size is halved when a request takes longer than target_seconds
+    or returns more than max_bytes, and doubled when a full page returns in
+    less than half of target_seconds. The size is kept within
+    [minimum, maximum]. Page requests give up after timeout_seconds, by
+    default three times target_seconds.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int,
+        maximum: int,
+        target_seconds: float,
+        max_bytes: int,
+        timeout_seconds: Optional[float] = None,
+    ):
+        self._lock = threading.Lock()
+        self._size = initial
+        self.configure(
+            minimum=minimum,
+            maximum=maximum,
+            target_seconds=target_seconds,
+            max_bytes=max_bytes,
+            timeout_seconds=timeout_seconds,
+        )
+
+    def configure(
+        self,
+        minimum: int,
+        maximum: int,
+        target_seconds: float,
+        max_bytes: int,
+        timeout_seconds: Optional[float] = None,
+    ) -> None:
+        """Sets the limits, and keeps the tuned page size within them."""
+        if minimum > maximum:
+            raise ValueError(f"min_rows {minimum} exceeds max_rows_limit {maximum}")
+        with self._lock:
+            self.minimum = minimum
+            self.maximum = maximum
+            self.target_seconds = target_seconds
+            self.max_bytes = max_bytes
+            self.timeout_seconds = (
+                timeout_seconds if timeout_seconds is not None else 3 * target_seconds
+            )
+            self._size = max(minimum, min(self._size, maximum))
+
+    def get(self) -> int:
+        return self._size
+
+    def shrink(self) -> bool:
+        """Halves the page size. Returns False if already at the minimum."""
+        with self._lock:
+            if self._size <= self.minimum:
+                return False
+            self._size = max(self.minimum, self._size // 2)
+            return True
+
+    def update(self, rows: int, max_rows: int, seconds: float, nbytes: int) -> None:
+        if seconds > self.target_seconds or nbytes > self.max_bytes:
+            self.shrink()
+        elif rows >= 0.9 * max_rows and seconds < self.target_seconds / 2:
+            with self._lock:
+                self._size = min(self.maximum, self._size * 2)
+
+
+# Tuned page sizes are kept per server and data source for the lifetime of
+# the process, so that new handlers start from the size found earlier. The
+# options of the most recently created handler set the limits.
+_page_sizes: Dict[Tuple[str, Optional[str]], AdaptivePageSize] = {}
+_page_sizes_lock = threading.Lock()
+
+
+def get_adaptive_page_size(
+    url: str,
+    datasource: Optional[str],
+    options: Dict[str, Any],
+    initial: int,
+    maximum: int,
+) -> AdaptivePageSize:
+    limits = dict(
+        minimum=options.get("min_rows", 100),
+        maximum=options.get("max_rows_limit", maximum),
+        target_seconds=options.get("target_page_seconds", 10.0),
+        max_bytes=options.get("max_page_bytes", 50_000_000),
+        timeout_seconds=options.get("page_timeout_seconds"),
+    )
+    with _page_sizes_lock:
+        key = (url, datasource)
+        if key in _page_sizes:
+            _page_sizes[key].configure(**limits)
+        else:
+            _page_sizes[key] = AdaptivePageSize(initial=initial, **limits)
+        return _page_sizes[key]
+
+
 class BaseHandlerWeb(ABC):
+    # Approximate size of one returned value in the JSON response
+    _bytes_per_row = 60
+
     def __init__(
         self,
         datasource: Optional[str],
@@ -190,6 +306,18 @@ class BaseHandlerWeb(ABC):
         if verify_ssl is False:
             urllib3.disable_warnings(InsecureRequestWarning)
         self.session.verify = verify_ssl if verify_ssl is not None else get_verify_ssl()
+        self.page_size: Optional[AdaptivePageSize] = None
+        self._local = threading.local()
+
+    @property
+    def read_timeout(self) -> Optional[float]:
+        """Read timeout for data requests, set when paging adaptively."""
+        return self.page_size.timeout_seconds if self.page_size is not None else None
+
+    @property
+    def last_response_bytes(self) -> int:
+        """Size of the last response received by the calling thread."""
+        return getattr(self._local, "last_response_bytes", 0)
 
     def fetch(
         self,
@@ -206,6 +334,7 @@ class BaseHandlerWeb(ABC):
             ),
         )  # Noqa. Read timeout, No connect timeout.
         res.raise_for_status()
+        self._local.last_response_bytes = len(res.content)
 
         if len(res.text) == 0:
             logger.warning(f"No data found for {url} {params}")
@@ -216,7 +345,7 @@ class BaseHandlerWeb(ABC):
             return {}
 
         try:
-            return res.json()
+            return self._decode_json(res)
         except JSONDecodeError:
             # AspenOne sometimes returns completely and utterly invalid -nan.
             # Since json/simplejson has no mechanism to handle this, we need to
@@ -225,6 +354,38 @@ class BaseHandlerWeb(ABC):
             txt = res.text.replace('"v":nan', '"v":NaN').replace('"v":-nan', '"v":NaN')
             return json.loads(txt)
 
+    def post(
+        self,
+        url,
+        data: Any = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[int] = None,
+    ) -> Dict:
+        res = self.session.post(
+            url,
+            json=data,
+            params=params,
+            timeout=(
+                None,
+                timeout,
+            ),
+        )  # Noqa. Read timeout, No connect timeout.
+        res.raise_for_status()
+        self._local.last_response_bytes = len(res.content)
+
+        if len(res.text) == 0:
+            logger.warning(f"No data found for {url}")
+            return {}
+
+        return self._decode_json(res)
+
+    @staticmethod
+    def _decode_json(res: requests.Response) -> Any:
+        """Decodes a JSON response, with orjson when it is installed."""
+        if orjson is not None:
+            return orjson.loads(res.content)
+        return res.json()
+
     def connect(self):
         try:
             self.verify_connection(self.datasource)
@@ -238,6 +399,8 @@ class BaseHandlerWeb(ABC):
 
 
 class AspenHandlerWeb(BaseHandlerWeb):
+    _bytes_per_row = 50
+
     def __init__(
         self,
         datasource: Optional[str],
@@ -258,7 +421,21 @@ class AspenHandlerWeb(BaseHandlerWeb):
             verify_ssl=verify_ssl,
         )
         self._max_rows = options.get("max_rows", 100000)
+        self._multi_tag_reads = options.get("multi_tag_reads", False)
+        self._max_tags_per_request = options.get("max_tags_per_request", 100)
+        self._max_url_length = options.get("max_url_length", 2000)
+        # Aggregate History reads return at most this many points per query
+        self._max_aggregate_rows = options.get("max_aggregate_rows", 10000)
         self._connection_string = ""  # Used for raw SQL queries
+        if options.get("adaptive_paging", False):
+            # Interpolated reads return an error for more than 100 000 points
+            self.page_size = get_adaptive_page_size(
+                url=self.base_url,
+                datasource=self.datasource,
+                options=options,
+                initial=self._max_rows,
+                maximum=100000,
+            )
 
     @staticmethod
     def generate_search_query(
@@ -283,12 +460,37 @@ class AspenHandlerWeb(BaseHandlerWeb):
         sample_time: Optional[timedelta],
         read_type: ReaderType,
         metadata: Any,
+        max_rows: Optional[int] = None,
+        pixels: Optional[int] = None,
     ):
-        # Maxpoints is used for Actual (raw) and Bestfit (shapepreserving).
-        # Probably need to handle this in another way at some point
+        """Generates the query for reading one tag. Maxpoints is max_rows for
+        Actual (raw) reads and pixels, the number of intervals, for Bestfit
+        (shapepreserving) reads, which falls back to max_rows if not given.
+        """
+        if max_rows is None:
+            max_rows = self._max_rows
+        if pixels is None:
+            pixels = max_rows
         stepped = 0
         outsiders = 0
 
+        if read_type == ReaderType.COUNT:
+            # Reads the good and the bad events as two <Tag> elements of one query
+            good, bad = (
+                self.generate_read_query(
+                    tagname=tagname,
+                    mapname=mapname,
+                    start=start,
+                    end=end,
+                    sample_time=sample_time,
+                    read_type=count_type,
+                    metadata=metadata,
+                    max_rows=max_rows,
+                )
+                for count_type in [ReaderType.GOOD, ReaderType.BAD]
+            )
+            return good[: -len("</Q>")] + bad[bad.index("<Tag>") :]
+
         rt = {
             ReaderType.RAW: 0,
             ReaderType.SHAPEPRESERVING: 2,
@@ -302,7 +504,7 @@ class AspenHandlerWeb(BaseHandlerWeb):
             ReaderType.COUNT: -1,
             ReaderType.GOOD: 11,
             ReaderType.BAD: 10,
-            ReaderType.TOTAL: -1,
+            ReaderType.TOTAL: 12,  # Scaled from the average by read_tag()
             ReaderType.SUM: 16,
             ReaderType.SNAPSHOT: -1,
         }.get(read_type, -1)
@@ -335,8 +537,10 @@ class AspenHandlerWeb(BaseHandlerWeb):
                 f"<Et>{int(end.timestamp()) * 1000}</Et>"
                 f"<RT>{rt}</RT>"
             )
-        if read_type in [ReaderType.RAW, ReaderType.SHAPEPRESERVING]:
-            query += f"<X>{self._max_rows}</X>"
+        if read_type == ReaderType.RAW:
+            query += f"<X>{max_rows}</X>"
+        elif read_type == ReaderType.SHAPEPRESERVING:
+            query += f"<X>{pixels}</X>"
         if read_type not in [ReaderType.INT, ReaderType.SNAPSHOT]:
             query += f"<O>{outsiders}</O>"
         if read_type not in [ReaderType.RAW]:
@@ -370,6 +574,68 @@ class AspenHandlerWeb(BaseHandlerWeb):
 
         return query
 
+    def generate_multi_read_queries(
+        self,
+        tags: List[str],
+        start: Optional[datetime],
+        end: Optional[datetime],
+        sample_time: Optional[timedelta],
+        read_type: ReaderType,
+        max_rows: Optional[int] = None,
+    ) -> List[Tuple[List[str], str]]:
+        """Generates queries with one <Tag> element per tag, each query
+        holding at most max_tags_per_request tags and keeping the URL below
+        max_url_length where possible.
+
+        Returns a list of (tags, query) tuples.
+        """
+        queries = []
+        for tag in tags:
+            tag_name, map_name = self.split_tagmap(tag)
+            queries.append(
+                self.generate_read_query(
+                    tagname=tag_name,
+                    mapname=map_name,
+                    start=start,
+                    end=end,
+                    sample_time=sample_time,
+                    read_type=read_type,
+                    metadata={},
+                    max_rows=max_rows,
+                )
+            )
+        return self._combine_queries(tags, queries)
+
+    def _combine_queries(
+        self, tags: List[str], single_queries: List[str]
+    ) -> List[Tuple[List[str], str]]:
+        """Packs the <Tag> elements of single tag queries into queries holding
+        at most max_tags_per_request tags, keeping the URL below max_url_length
+        where possible.
+
+        Returns a list of (tags, query) tuples.
+        """
+        chunks: List[List[str]] = []
+        queries: List[str] = []
+        length = 0
+        for tag, query in zip(tags, single_queries):
+            # Split the query into the <Q> header and the <Tag> element
+            header, element = query[: -len("</Q>")].split("<Tag>", 1)
+            element = "<Tag>" + element
+            element_length = len(urllib.parse.quote(element))
+            if (
+                not chunks
+                or len(chunks[-1]) >= self._max_tags_per_request
+                or length + element_length > self._max_url_length
+            ):
+                chunks.append([])
+                queries.append(header)
+                length = len(self.base_url) + len(urllib.parse.quote(header + "</Q>"))
+            chunks[-1].append(tag)
+            queries[-1] += element
+            length += element_length
+        return [(chunk, query + "</Q>") for chunk, query in zip(chunks, queries)]
+
     def verify_connection(self, datasource: str):
         """Connects to the URL and verifies that the provided data source exists.
 
@@ -489,16 +755,12 @@ class AspenHandlerWeb(BaseHandlerWeb):
         if "tags" not in data["data"]:
             return ret
 
-        for item in data["data"]["tags"]:
-            tagname = item["t"]
-            if not desc and not return_desc:
-                ret.append(tagname)
-            else:
-                try:
-                    description = self._get_tag_description(tagname)
-                except KeyError:
-                    description = ""
-                ret.append((tagname, description))
+        tagnames = [item["t"] for item in data["data"]["tags"]]
+        if not desc and not return_desc:
+            ret = tagnames
+        else:
+            descriptions = self._get_tag_descriptions(tagnames)
+            ret = [(tagname, descriptions[tagname]) for tagname in tagnames]
 
         if not desc:
             pass
@@ -547,6 +809,44 @@ class AspenHandlerWeb(BaseHandlerWeb):
         ]
         return "".join(parts)
 
+    def generate_get_descriptions_queries(
+        self, tags: List[str]
+    ) -> List[Tuple[List[str], str]]:
+        """Generates TagInfo queries reading the description of several tags,
+        with one <Tag> element per tag.
+
+        Returns a list of (tags, query) tuples.
+        """
+        queries = [self.generate_get_description_query(tag) for tag in tags]
+        return self._combine_queries(tags, queries)
+
+    def _get_tag_descriptions(self, tags: List[str]) -> Dict[str, str]:
+        """Reads the descriptions of several tags, with as few TagInfo
+        requests as the URL length allows."""
+        url = urljoin(self.base_url, "TagInfo")
+        result = {}
+        for chunk, query in self.generate_get_descriptions_queries(tags):
+            try:
+                data = self.fetch(url, params=query)
+                items = data["data"]["tags"]
+            except (JSONDecodeError, KeyError):
+                items = []
+            if len(items) != len(chunk):
+                # Cannot tell which tags are missing, so read them one by one
+                for tag in chunk:
+                    try:
+                        result[tag] = self._get_tag_description(tag)
+                    except KeyError:
+                        result[tag] = ""
+                continue
+            # Results are returned in the order of the <Tag> elements
+            for tag, item in zip(chunk, items):
+                try:
+                    result[tag] = item["attrData"][0]["samples"][0]["v"]
+                except (KeyError, IndexError):
+                    result[tag] = ""
+        return result
+
     def _get_tag_description(self, tag: str):
         query = self.generate_get_description_query(tag)
         url = urljoin(self.base_url, "TagInfo")
@@ -568,7 +868,11 @@ class AspenHandlerWeb(BaseHandlerWeb):
         read_type: ReaderType,
         metadata: Optional[Dict[str, str]],
         get_status: bool = False,
+        max_rows: Optional[int] = None,
+        pixels: Optional[int] = None,
     ):
+        if max_rows is None:
+            max_rows = self._max_rows
         if read_type not in [
             ReaderType.INT,
             ReaderType.MIN,
@@ -579,6 +883,12 @@ class AspenHandlerWeb(BaseHandlerWeb):
             ReaderType.STD,
             ReaderType.SNAPSHOT,
             ReaderType.RAW,
+            ReaderType.SHAPEPRESERVING,
+            ReaderType.COUNT,
+            ReaderType.GOOD,
+            ReaderType.BAD,
+            ReaderType.TOTAL,
+            ReaderType.SUM,
         ]:
             raise NotImplementedError
 
@@ -588,14 +898,13 @@ class AspenHandlerWeb(BaseHandlerWeb):
             url = urljoin(self.base_url, "History")
 
         # Actual and bestfit read types allow specifying maxpoints.
-        # Aggregate reads limit to 10 000 points and issue a moredata-token.
-        # TODO: May need to look into using this later - most likely more
-        # efficient than creating new query starting at previous end time.
+        # Aggregate reads limit to 10 000 points and issue a moredata-token,
+        # which is passed back to continue the same query.
         # Interpolated reads return error message if more than 100 000 points,
         # so we need to limit the range. Note -1 because INT normally includes
         # both start and end time.
         if read_type == ReaderType.INT:
-            end = min(end, start + sample_time * (self._max_rows - 1))
+            end = min(end, start + sample_time * (max_rows - 1))
 
         tag_name, map_name = self.split_tagmap(tag)
 
@@ -607,28 +916,206 @@ class AspenHandlerWeb(BaseHandlerWeb):
             sample_time=sample_time,
             read_type=read_type,
             metadata={},
+            max_rows=max_rows,
+            pixels=pixels,
         )
 
-        data = self.fetch(url, params=params)
+        data = self.fetch(url, params=params, timeout=self.read_timeout)
 
         if len(data) == 0:  # Normally for timestamps in future
             return pd.DataFrame(columns=[tag])
 
-        if "er" in data["data"][0]["samples"][0]:
-            logger.warning(
-                f"API error for {tag}: {data['data'][0]['samples'][0]['es']} params: {params}"
+        items = data["data"]
+        if read_type != ReaderType.INT:
+            items = self._follow_moredata_tokens(url, params, items, max_rows=max_rows)
+        return self._parse_tag_data(
+            items,
+            tag=tag,
+            sample_time=sample_time,
+            read_type=read_type,
+            get_status=get_status,
+            params=params,
+        )
+
+    def _follow_moredata_tokens(
+        self,
+        url: str,
+        query: str,
+        items: List[Dict[str, Any]],
+        max_rows: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Continues the <Tag> elements of a History query that returned a
+        moredata token, until the server returns all data or, if given, each
+        element holds max_rows samples.
+
+        Returns the items with the samples of the continuations appended.
+        """
+        items = [dict(item, samples=list(item["samples"])) for item in items]
+        elements = re.findall(r"<Tag>.*?</Tag>", query, flags=re.DOTALL)
+        head = query[: query.index("<Tag>")]
+        pending = [
+            (j, item["moredata"])
+            for j, item in enumerate(items)
+            if item.get("moredata")
+            and (max_rows is None or len(item["samples"]) < max_rows)
+        ]
+        while pending:
+            continuation = (
+                head
+                + "".join(
+                    self.generate_moredata_query(elements[j], token)
+                    for j, token in pending
+                )
+                + "</Q>"
+            )
+            data = self.fetch(url, params=continuation, timeout=self.read_timeout)
+            more = data.get("data", []) if len(data) > 0 else []
+            next_pending = []
+            for (j, _), item in zip(pending, more):
+                samples = item.get("samples", [])
+                if not samples or "er" in samples[0]:
+                    continue
+                items[j]["samples"].extend(samples)
+                if max_rows is not None and len(items[j]["samples"]) >= max_rows:
+                    continue
+                if item.get("moredata"):
+                    next_pending.append((j, item["moredata"]))
+            pending = next_pending
+        return items
+
+    @staticmethod
+    def generate_moredata_query(query: str, token: str) -> str:
+        """Continues the first <Tag> element of a History query from where
+        the previous response ended."""
+        return query.replace("</Tag>", f"<MD><![CDATA[{token}]]></MD></Tag>", 1)
+
+    def _parse_tag_data(
+        self,
+        items: List[Dict[str, Any]],
+        tag: str,
+        sample_time: Optional[timedelta],
+        read_type: ReaderType,
+        get_status: bool,
+        params: str,
+    ) -> pd.DataFrame:
+        """Parses the data items returned for the <Tag> elements of a single tag
+        into a DataFrame, formatted as returned by read_tag()."""
+        df = self._parse_samples(
+            items[0]["samples"], tag=tag, get_status=get_status, params=params
+        )
+        if read_type == ReaderType.COUNT and len(items) > 1:
+            bad = self._parse_samples(
+                items[1]["samples"], tag=tag, get_status=False, params=params
             )
+            df[tag] = df[tag].add(bad[tag].reindex(df.index), fill_value=0)
+        elif read_type == ReaderType.TOTAL:
+            # Like PI Web API, totals treat the values as rates per day
+            df[tag] = df[tag] * (sample_time / timedelta(days=1))
+        return df
+
+    def read_tags(
+        self,
+        tags: List[str],
+        start: Optional[datetime],
+        end: Optional[datetime],
+        sample_time: Optional[timedelta],
+        read_type: ReaderType,
+        get_status: bool = False,
+        max_rows: Optional[int] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """Reads several tags with one <Tag> element per tag in each query.
+
+        Snapshots are read from Attribute, interpolated and aggregated data
+        from History. History queries hold no more tags than there is room
+        for within max_rows, or for aggregates within the 10 000 points the
+        server returns per query. Aggregate reads follow the moredata token
+        of each <Tag> element when the server still cuts the response short.
+
+        Returns a DataFrame per tag, formatted as returned by read_tag().
+        """
+        if max_rows is None:
+            max_rows = self._max_rows
+        if read_type not in [
+            ReaderType.INT,
+            ReaderType.MIN,
+            ReaderType.MAX,
+            ReaderType.RNG,
+            ReaderType.AVG,
+            ReaderType.VAR,
+            ReaderType.STD,
+            ReaderType.SNAPSHOT,
+            ReaderType.COUNT,
+            ReaderType.GOOD,
+            ReaderType.BAD,
+            ReaderType.TOTAL,
+            ReaderType.SUM,
+        ]:
+            raise NotImplementedError
+
+        # COUNT reads two <Tag> elements per tag
+        items_per_tag = 2 if read_type == ReaderType.COUNT else 1
+        if read_type == ReaderType.SNAPSHOT:
+            url = urljoin(self.base_url, "Attribute")
+            tags_per_query = len(tags)
+        else:
+            url = urljoin(self.base_url, "History")
+            if read_type == ReaderType.INT:
+                end = min(end, start + sample_time * (max_rows - 1))
+                max_points = max_rows
+            else:
+                max_points = min(max_rows, self._max_aggregate_rows)
+            rows_per_tag = (int((end - start) / sample_time) + 1) * items_per_tag
+            tags_per_query = max(1, max_points // rows_per_tag)
+
+        result = {tag: pd.DataFrame(columns=[tag]) for tag in tags}
+        for i in range(0, len(tags), tags_per_query):
+            for chunk, params in self.generate_multi_read_queries(
+                tags=tags[i : i + tags_per_query],
+                start=start,
+                end=end,
+                sample_time=sample_time,
+                read_type=read_type,
+                max_rows=max_rows,
+            ):
+                data = self.fetch(url, params=params, timeout=self.read_timeout)
+                if len(data) == 0:  # Normally for timestamps in future
+                    continue
+                elements = data["data"]
+                if read_type not in [ReaderType.INT, ReaderType.SNAPSHOT]:
+                    elements = self._follow_moredata_tokens(url, params, elements)
+                # Results are returned in the order of the <Tag> elements
+                for j, tag in enumerate(chunk):
+                    items = elements[j * items_per_tag : (j + 1) * items_per_tag]
+                    if not items:
+                        break
+                    result[tag] = self._parse_tag_data(
+                        items,
+                        tag=tag,
+                        sample_time=sample_time,
+                        read_type=read_type,
+                        get_status=get_status,
+                        params=params,
+                    )
+        return result
+
+    @staticmethod
+    def _parse_samples(
+        samples: List[Dict[str, Any]], tag: str, get_status: bool, params: str
+    ) -> pd.DataFrame:
+        """Parses the samples returned for a single tag into a DataFrame."""
+        if "er" in samples[0]:
+            logger.warning(f"API error for {tag}: {samples[0]['es']} params: {params}")
             return pd.DataFrame(columns=[tag])
         if get_status:
             # The "l" field maps 1:1 to ODBC status field values 0, 1, 2, 4, 5, 6
             df = (
-                pd.DataFrame.from_dict(data["data"][0]["samples"])
+                pd.DataFrame.from_dict(samples)
                 .drop(labels=["s", "V"], axis="columns")
                 .rename(columns={"t": "Timestamp", "v": "Value", "l": "Status"})
             )
         else:
             df = (
-                pd.DataFrame.from_dict(data["data"][0]["samples"])
+                pd.DataFrame.from_dict(samples)
                 .drop(labels=["l", "s", "V"], axis="columns")
                 .rename(columns={"t": "Timestamp", "v": "Value"})
             )
@@ -707,6 +1194,31 @@ class AspenHandlerWeb(BaseHandlerWeb):
 
 
 class PIHandlerWeb(BaseHandlerWeb):
+    _summary_types = {
+        ReaderType.MIN: "Minimum",
+        ReaderType.MAX: "Maximum",
+        ReaderType.AVG: "Average",
+        ReaderType.VAR: "StdDev",
+        ReaderType.STD: "StdDev",
+        ReaderType.RNG: "Range",
+        ReaderType.COUNT: "Count",
+        ReaderType.GOOD: "Count",
+        ReaderType.BAD: "Count",
+        ReaderType.TOTAL: "Total",
+        ReaderType.SUM: "Total",
+    }
+    # Summaries over events rather than time. The event weighted Total is the
+    # sum of the values.
+    _event_weighted = [
+        ReaderType.COUNT,
+        ReaderType.GOOD,
+        ReaderType.BAD,
+        ReaderType.SUM,
+    ]
+    # PI counts good events only. The number of bad events is derived from the
+    # percentage of good events, read with the count.
+    _percent_good_types = [ReaderType.COUNT, ReaderType.BAD]
+
     def __init__(
         self,
         url: Optional[str],
@@ -728,7 +1240,33 @@ class PIHandlerWeb(BaseHandlerWeb):
             verify_ssl=verify_ssl,
         )
         self._max_rows = options.get("max_rows", 10000)
+        self._batch_reads = options.get("batch_reads", False)
+        self._multi_tag_reads = (
+            options.get("multi_tag_reads", False) or self._batch_reads
+        )
+        self._max_tags_per_request = options.get("max_tags_per_request", 100)
+        self._max_url_length = options.get("max_url_length", 2000)
+        # Default value of MaxReturnedItemsPerCall in PI Web API
+        self._max_items_per_call = options.get("max_items_per_call", 150000)
         self.web_id_cache = cache
+        self._web_ids: Dict[str, str] = {}
+        self._dataserver_web_id: Optional[str] = None
+        self._path_web_ids = options.get("path_web_ids", False)
+        self._search_page_size = options.get("search_page_size", 1000)
+        self._max_search_workers = options.get("max_search_workers", 4)
+        self._rejected_path_web_ids: Set[str] = set()
+        self._dataserver_lock = threading.Lock()
+        self._dataserver_cache_seconds = options.get(
+            "dataserver_cache_seconds", 24 * 3600
+        )
+        if options.get("adaptive_paging", False):
+            self.page_size = get_adaptive_page_size(
+                url=self.base_url,
+                datasource=self.datasource,
+                options=options,
+                initial=self._max_rows,
+                maximum=self._max_items_per_call,
+            )
 
     @staticmethod
     def _time_to_UTC_string(time: datetime) -> str:
@@ -768,6 +1306,7 @@ class PIHandlerWeb(BaseHandlerWeb):
         desc: Optional[str],
         datasource: Optional[str],
         auth: Optional[Any] = None,
+        dataserver_web_id: Optional[str] = None,
     ) -> Dict[str, str]:
         q = []
         if tag is not None:
@@ -777,7 +1316,9 @@ class PIHandlerWeb(BaseHandlerWeb):
         query = " AND ".join(q)
         params = {"query": f"{query}"}
 
-        if datasource is not None:
+        if dataserver_web_id is not None:
+            params["dataserverwebid"] = dataserver_web_id
+        elif datasource is not None:
             params["dataserverwebid"] = (
                 f"{get_piwebapi_source_to_webid_dict(auth=auth)[datasource]}"
             )
@@ -793,21 +1334,13 @@ class PIHandlerWeb(BaseHandlerWeb):
         read_type: ReaderType,
         metadata: Optional[Dict[str, str]],
         get_status: bool = False,
+        max_rows: Optional[int] = None,
+        pixels: Optional[int] = None,
     ) -> Tuple[str, Dict[str, str]]:
-        if read_type in [
-            ReaderType.COUNT,
-            ReaderType.GOOD,
-            ReaderType.BAD,
-            ReaderType.TOTAL,
-            ReaderType.SUM,
-            ReaderType.SHAPEPRESERVING,
-        ]:
-            raise NotImplementedError
-
         web_id = tag
 
         seconds = 0
-        if read_type != ReaderType.SNAPSHOT:
+        if sample_time is not None and read_type != ReaderType.SNAPSHOT:
             seconds = int(sample_time.total_seconds())
 
         get_action = {
@@ -828,23 +1361,24 @@ class PIHandlerWeb(BaseHandlerWeb):
             params["time"] = self._time_to_UTC_string(end)
             params["timeZone"] = "UTC"
 
-        summary_type = {
-            ReaderType.MIN: "Minimum",
-            ReaderType.MAX: "Maximum",
-            ReaderType.AVG: "Average",
-            ReaderType.VAR: "StdDev",
-            ReaderType.STD: "StdDev",
-            ReaderType.RNG: "Range",
-        }.get(read_type, None)
+        summary_type = self._summary_types.get(read_type, None)
 
         if ReaderType.INT == read_type:
             params["interval"] = f"{seconds}s"
         elif summary_type:
             params["summaryType"] = summary_type
             params["summaryDuration"] = f"{seconds}s"
+            if read_type in self._percent_good_types:
+                params["summaryType"] = [summary_type, "PercentGood"]
+            if read_type in self._event_weighted:
+                params["calculationBasis"] = "EventWeighted"
 
         if self._is_summary(read_type):
             params["selectedFields"] = "Links;Items.Value.Timestamp;Items.Value.Value"
+            if read_type in self._percent_good_types:
+                params["selectedFields"] = params["selectedFields"].replace(
+                    "Links;", "Links;Items.Type;"
+                )
             if get_status:
                 params[
                     "selectedFields"
@@ -863,10 +1397,355 @@ class PIHandlerWeb(BaseHandlerWeb):
                 params["selectedFields"] += ";Good;Questionable;Substituted"
 
         if read_type == ReaderType.RAW:
-            params["maxCount"] = self._max_rows
+            params["maxCount"] = max_rows if max_rows is not None else self._max_rows
+        elif read_type == ReaderType.SHAPEPRESERVING:
+            # Each interval returns up to five values: first, last, min, max
+            # and any exception values
+            if pixels is None:
+                pixels = max_rows if max_rows is not None else self._max_rows
+            params["intervals"] = pixels
 
         return url, params
 
+    def generate_multi_read_query(
+        self,
+        web_ids: List[str],
+        start: datetime,
+        end: datetime,
+        sample_time: timedelta,
+        read_type: ReaderType,
+        get_status: bool = False,
+        max_rows: Optional[int] = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Generates a streamsets query reading several streams in one request.
+
+        The parameters are the same as for a single stream, except that the
+        selected fields are nested one level deeper, under each stream.
+        """
+        url, params = self.generate_read_query(
+            tag="",
+            start=start,
+            end=end,
+            sample_time=sample_time,
+            read_type=read_type,
+            metadata=None,
+            get_status=get_status,
+            max_rows=max_rows,
+        )
+        prefix = "Items.Value." if read_type == ReaderType.SNAPSHOT else "Items."
+        fields = [f for f in params["selectedFields"].split(";") if f != "Links"]
+        params["selectedFields"] = ";".join(
+            ["Items.WebId"] + [prefix + field for field in fields]
+        )
+        params["webId"] = web_ids
+        return f"streamsets/{url.split('/')[-1]}", params
+
+    def _chunk_for_url(
+        self,
+        values: List[str],
+        url: str,
+        prefix: str,
+        params: Optional[Dict[str, Any]] = None,
+        max_values: Optional[int] = None,
+    ) -> List[List[str]]:
+        """Splits values into groups that keep each request below the
+        configured number of values, or max_values if smaller, and URL
+        length, when each value is added to the URL as prefix followed by
+        the URL encoded value.
+
+        params are the other query parameters sent with each request.
+        """
+        if params:
+            url += "?" + urllib.parse.urlencode(params, doseq=True)
+        if max_values is None or max_values > self._max_tags_per_request:
+            max_values = self._max_tags_per_request
+        chunks: List[List[str]] = []
+        length = 0
+        for value in values:
+            item_length = len(prefix) + len(urllib.parse.quote_plus(value))
+            if (
+                not chunks
+                or len(chunks[-1]) >= max_values
+                or length + item_length > self._max_url_length
+            ):
+                chunks.append([])
+                length = len(url)
+            chunks[-1].append(value)
+            length += item_length
+        return chunks
+
+    def read_tags(
+        self,
+        tags: List[str],
+        start: Optional[datetime],
+        end: Optional[datetime],
+        sample_time: Optional[timedelta],
+        read_type: ReaderType,
+        get_status: bool = False,
+        max_rows: Optional[int] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """Reads several tags using the streamsets endpoints, with as few
+        requests as the URL length and number of streams per request allow.
+        Each request reads no more streams than there is room for within
+        max_items_per_call values.
+
+        Returns a DataFrame per tag, formatted as returned by read_tag().
+        """
+        if self._batch_reads:
+            return self.read_tags_batch(
+                tags=tags,
+                start=start,
+                end=end,
+                sample_time=sample_time,
+                read_type=read_type,
+                get_status=get_status,
+                max_rows=max_rows,
+            )
+
+        tags_by_web_id: Dict[str, List[str]] = {}
+        for tag, web_id in self.tags_to_web_ids(tags).items():
+            if web_id:
+                tags_by_web_id.setdefault(web_id, []).append(tag)
+
+        url, params = self.generate_multi_read_query(
+            web_ids=[],
+            start=start,
+            end=end,
+            sample_time=sample_time,
+            read_type=read_type,
+            get_status=get_status,
+            max_rows=max_rows,
+        )
+        streams_per_request = None
+        if read_type == ReaderType.RAW:
+            rows = max_rows if max_rows is not None else self._max_rows
+            streams_per_request = max(1, self._max_items_per_call // rows)
+        elif read_type != ReaderType.SNAPSHOT:
+            rows = int((end - start) / sample_time) + 1
+            # Summaries with PercentGood return two values per interval
+            if read_type in self._percent_good_types:
+                rows *= 2
+            streams_per_request = max(1, self._max_items_per_call // rows)
+        result = {tag: pd.DataFrame() for tag in tags}
+        for web_ids in self._chunk_for_url(
+            list(tags_by_web_id),
+            url=urljoin(self.base_url, url),
+            prefix="&webId=",
+            params=params,
+            max_values=streams_per_request,
+        ):
+            url, params = self.generate_multi_read_query(
+                web_ids=web_ids,
+                start=start,
+                end=end,
+                sample_time=sample_time,
+                read_type=read_type,
+                get_status=get_status,
+                max_rows=max_rows,
+            )
+            try:
+                data = self.fetch(urljoin(self.base_url, url), params=params)
+            except requests.exceptions.HTTPError as e:
+                rejected = [
+                    tag
+                    for web_id in web_ids
+                    for tag in tags_by_web_id[web_id]
+                    if self._reject_path_web_id(tag, web_id, e.response.status_code)
+                ]
+                if not rejected:
+                    raise
+                result.update(
+                    self.read_tags(
+                        tags=[
+                            tag for web_id in web_ids for tag in tags_by_web_id[web_id]
+                        ],
+                        start=start,
+                        end=end,
+                        sample_time=sample_time,
+                        read_type=read_type,
+                        get_status=get_status,
+                        max_rows=max_rows,
+                    )
+                )
+                continue
+            for item in data.get("Items", []):
+                for tag in tags_by_web_id.get(item["WebId"], []):
+                    result[tag] = self._parse_stream_data(
+                        data=(
+                            item.get("Value", {})
+                            if read_type == ReaderType.SNAPSHOT
+                            else item
+                        ),
+                        tag=tag,
+                        start=start,
+                        sample_time=sample_time,
+                        read_type=read_type,
+                        get_status=get_status,
+                    )
+        return result
+
+    def generate_batch_read_request(
+        self,
+        tags: List[str],
+        start: Optional[datetime],
+        end: Optional[datetime],
+        sample_time: Optional[timedelta],
+        read_type: ReaderType,
+        get_status: bool = False,
+        max_rows: Optional[int] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Generates the body of a batch request reading each of the tags.
+
+        Tags with an unknown WebId get a search sub-request, and the read
+        sub-request picks the WebId from the search response through
+        ParentIds and Parameters. Sub-requests are named search_<n> and
+        read_<n>, where n is the position of the tag in tags.
+        """
+        batch: Dict[str, Dict[str, Any]] = {}
+        for i, tag in enumerate(tags):
+            web_id = self._known_web_id(tag)
+            if web_id is None:
+                web_id = "{0}"
+                params = self.generate_search_params(
+                    tag=tag,
+                    datasource=self.datasource,
+                    desc=None,
+                    auth=self.auth,
+                    dataserver_web_id=self.dataserver_web_id,
+                )
+                batch[f"search_{i}"] = {
+                    "Method": "GET",
+                    "Resource": urljoin(self.base_url, "points", "search")
+                    + "?"
+                    + urllib.parse.urlencode(params, doseq=True),
+                }
+            url, params = self.generate_read_query(
+                tag=web_id,
+                start=start,
+                end=end,
+                sample_time=sample_time,
+                read_type=read_type,
+                metadata={},
+                get_status=get_status,
+                max_rows=max_rows,
+            )
+            batch[f"read_{i}"] = {
+                "Method": "GET",
+                "Resource": urljoin(self.base_url, url)
+                + "?"
+                + urllib.parse.urlencode(params, doseq=True),
+            }
+            if f"search_{i}" in batch:
+                batch[f"read_{i}"]["ParentIds"] = [f"search_{i}"]
+                batch[f"read_{i}"]["Parameters"] = [
+                    f"$.search_{i}.Content.Items[0].WebId"
+                ]
+        return batch
+
+    def read_tags_batch(
+        self,
+        tags: List[str],
+        start: Optional[datetime],
+        end: Optional[datetime],
+        sample_time: Optional[timedelta],
+        read_type: ReaderType,
+        get_status: bool = False,
+        max_rows: Optional[int] = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """Reads several tags, including any WebId lookups, with one POST to
+        the batch endpoint per max_tags_per_request tags.
+
+        Returns a DataFrame per tag, formatted as returned by read_tag().
+        """
+        url = urljoin(self.base_url, "batch")
+        result = {}
+        rejected = []
+        for i in range(0, len(tags), self._max_tags_per_request):
+            chunk = tags[i : i + self._max_tags_per_request]
+            data = self.post(
+                url,
+                data=self.generate_batch_read_request(
+                    tags=chunk,
+                    start=start,
+                    end=end,
+                    sample_time=sample_time,
+                    read_type=read_type,
+                    get_status=get_status,
+                    max_rows=max_rows,
+                ),
+            )
+            for j, tag in enumerate(chunk):
+                result[tag] = pd.DataFrame()
+                search = data.get(f"search_{j}")
+                if search is not None:
+                    if search.get("Status") != 200:
+                        logger.warning(
+                            f"Batch search for {tag} failed with status "
+                            f"{search.get('Status')}: {search.get('Content')}"
+                        )
+                        continue
+                    web_id = self._web_id_from_search(tag, search["Content"])
+                    if web_id is None:
+                        continue
+                    self._remember_web_id(tag, web_id)
+                read = data.get(f"read_{j}", {})
+                if search is None and self._reject_path_web_id(
+                    tag, self._known_web_id(tag), read.get("Status")
+                ):
+                    rejected.append(tag)
+                    continue
+                if read.get("Status") != 200:
+                    logger.warning(
+                        f"Batch read of {tag} failed with status "
+                        f"{read.get('Status')}: {read.get('Content')}"
+                    )
+                    continue
+                result[tag] = self._parse_stream_data(
+                    data=read["Content"],
+                    tag=tag,
+                    start=start,
+                    sample_time=sample_time,
+                    read_type=read_type,
+                    get_status=get_status,
+                )
+        if rejected:
+            result.update(
+                self.read_tags_batch(
+                    tags=rejected,
+                    start=start,
+                    end=end,
+                    sample_time=sample_time,
+                    read_type=read_type,
+                    get_status=get_status,
+                    max_rows=max_rows,
+                )
+            )
+        return result
+
+    @property
+    def dataserver_web_id(self) -> Optional[str]:
+        """WebId of the data source, looked up once per handler and kept in
+        the cache for dataserver_cache_seconds."""
+        if self.datasource is None:
+            return None
+        with self._dataserver_lock:
+            if self._dataserver_web_id is not None:
+                return self._dataserver_web_id
+            key = f"$dataserver${self.base_url}${self.datasource}"
+            if self.web_id_cache is not None:
+                self._dataserver_web_id = self.web_id_cache.get(key)
+            if self._dataserver_web_id is None:
+                data = self.fetch(urljoin(self.base_url, "dataservers"))
+                dataservers = {item["Name"]: item["WebId"] for item in data["Items"]}
+                self._dataserver_web_id = dataservers[self.datasource]
+                if self.web_id_cache is not None:
+                    self.web_id_cache.set(
+                        key,
+                        self._dataserver_web_id,
+                        expire=self._dataserver_cache_seconds,
+                    )
+            return self._dataserver_web_id
+
     def verify_connection(self, datasource: str) -> bool:
         """Connects to the URL and verifies that the provided data source exists.
 
@@ -890,28 +1769,84 @@ class PIHandlerWeb(BaseHandlerWeb):
         timeout: Optional[int] = None,
         return_desc: bool = True,
     ) -> Union[List[Tuple[str, str]], List[str]]:
+        return list(
+            self.iter_search(
+                tag=tag, desc=desc, timeout=timeout, return_desc=return_desc
+            )
+        )
+
+    def iter_search(
+        self,
+        tag: Optional[str] = None,
+        desc: Optional[str] = None,
+        timeout: Optional[int] = None,
+        return_desc: bool = True,
+    ) -> Iterator[Union[Tuple[str, str], str]]:
+        """Yields search results as each page of search_page_size results
+        arrives. When the first page is full and tells where the last page
+        starts, the remaining pages are fetched by up to max_search_workers
+        threads. Otherwise the Next links are followed one page at a time.
+        """
         params = self.generate_search_params(
-            tag=tag, desc=desc, datasource=self.datasource, auth=self.auth
+            tag=tag,
+            desc=desc,
+            datasource=self.datasource,
+            auth=self.auth,
+            dataserver_web_id=self.dataserver_web_id,
         )
         url = urljoin(self.base_url, "points", "search")
-        done = False
-        ret = []
-        while not done:
-            data = self.fetch(url, params=params, timeout=timeout)
+        count = self._search_page_size
 
-            for item in data["Items"]:
-                description = item["Descriptor"] if "Descriptor" in item else ""
-                ret.append((item["Name"], description))
-            # next_start = int(data["Links"]["Next"].split("=")[-1])
-            # if int(data["Links"]["Last"].split("=")[-1]) >= next_start:
-            #     params["start"] = next_start  # noqa
-            # else:
-            done = True
+        def fetch_page(start: int) -> Dict[str, Any]:
+            return self.fetch(
+                url, params={**params, "start": start, "count": count}, timeout=timeout
+            )
 
-        if not return_desc:
-            ret = [x[0] for x in ret]
+        data = fetch_page(0)
+        yield from self._parse_search_page(data, return_desc)
+        last = self._get_link_start(data, "Last")
+        if last is not None and len(data["Items"]) == count:
+            starts = range(count, last + 1, count)
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(self._max_search_workers, len(starts)))
+            ) as pool:
+                for data in pool.map(fetch_page, starts):
+                    yield from self._parse_search_page(data, return_desc)
+            return
+
+        for data in self._follow_next_links(data, fetch_page):
+            yield from self._parse_search_page(data, return_desc)
+
+    def _follow_next_links(
+        self, data: Dict[str, Any], fetch_page: Callable[[int], Dict[str, Any]]
+    ) -> Iterator[Dict[str, Any]]:
+        """Yields the search pages after data. The server may return fewer
+        items per page than requested, so the Next link is followed for as
+        long as there is one."""
+        previous, start = 0, self._get_link_start(data, "Next")
+        while start is not None and start > previous and data.get("Items"):
+            data = fetch_page(start)
+            yield data
+            previous, start = start, self._get_link_start(data, "Next")
 
-        return ret
+    @staticmethod
+    def _parse_search_page(
+        data: Dict[str, Any], return_desc: bool
+    ) -> List[Union[Tuple[str, str], str]]:
+        if return_desc:
+            return [
+                (item["Name"], item.get("Descriptor", "")) for item in data["Items"]
+            ]
+        return [item["Name"] for item in data["Items"]]
+
+    @staticmethod
+    def _get_link_start(data: Dict[str, Any], link: str) -> Optional[int]:
+        """Returns the start parameter of a pagination link, if any."""
+        url = data.get("Links", {}).get(link)
+        if not url:
+            return None
+        start = urllib.parse.parse_qs(urllib.parse.urlparse(url).query).get("start")
+        return int(start[0]) if start else None
 
     def _get_tag_metadata(self, tag: str) -> Dict[str, str]:
         return {}  # FIXME
@@ -921,7 +1856,12 @@ class PIHandlerWeb(BaseHandlerWeb):
         if web_id is None:
             return None
         url = urljoin(self.base_url, "points", web_id)
-        data = self.fetch(url)
+        try:
+            data = self.fetch(url)
+        except requests.exceptions.HTTPError as e:
+            if self._reject_path_web_id(tag, web_id, e.response.status_code):
+                return self._get_tag_unit(tag)
+            raise
         unit = data["EngineeringUnits"]
         return unit
 
@@ -930,7 +1870,12 @@ class PIHandlerWeb(BaseHandlerWeb):
         if web_id is None:
             return None
         url = urljoin(self.base_url, "points", web_id)
-        data = self.fetch(url)
+        try:
+            data = self.fetch(url)
+        except requests.exceptions.HTTPError as e:
+            if self._reject_path_web_id(tag, web_id, e.response.status_code):
+                return self._get_tag_description(tag)
+            raise
         description = data["Descriptor"]
         return description
 
@@ -943,15 +1888,128 @@ class PIHandlerWeb(BaseHandlerWeb):
         :return: WebId
         :rtype: str
         """
-        if self.web_id_cache and tag in self.web_id_cache:
-            return self.web_id_cache[tag]
+        web_id = self._known_web_id(tag)
+        if web_id is not None:
+            return web_id
 
         params = self.generate_search_params(
-            tag=tag, datasource=self.datasource, desc=None, auth=self.auth
+            tag=tag,
+            datasource=self.datasource,
+            desc=None,
+            auth=self.auth,
+            dataserver_web_id=self.dataserver_web_id,
         )
         url = urljoin(self.base_url, "points", "search")
         data = self.fetch(url, params=params)
+        web_id = self._web_id_from_search(tag, data)
 
+        if web_id:
+            self._remember_web_id(tag, web_id)
+        return web_id
+
+    def tags_to_web_ids(self, tags: List[str]) -> Dict[str, Optional[str]]:
+        """Given a list of tags, returns the WebId of each tag.
+
+        Tags with unknown WebIds are looked up with one search per
+        max_tags_per_request tags, by OR'ing name queries together, following
+        the Next links when the server returns fewer results per page.
+
+        :param tags: The tags
+        :type tags: List[str]
+        :raises ConnectionError: If connection or query fails
+        :return: WebId per tag, None for tags that were not found
+        :rtype: Dict[str, Optional[str]]
+        """
+        web_ids = {tag: self._known_web_id(tag) for tag in tags}
+        escaped = {
+            self.escape(tag): tag for tag, web_id in web_ids.items() if web_id is None
+        }
+        if not escaped:
+            return web_ids
+        url = urljoin(self.base_url, "points", "search")
+        params = self.generate_search_params(
+            tag=None,
+            datasource=self.datasource,
+            desc=None,
+            auth=self.auth,
+            dataserver_web_id=self.dataserver_web_id,
+        )
+        params["query"] = "name:"
+        params["count"] = max(self._search_page_size, self._max_tags_per_request)
+        for chunk in self._chunk_for_url(
+            list(escaped), url=url, prefix="+OR+name%3A", params=params
+        ):
+            query = {
+                **params,
+                "query": " OR ".join(f"name:{name}" for name in chunk),
+            }
+
+            def fetch_page(start: int) -> Dict[str, Any]:
+                return self.fetch(url, params={**query, "start": start})
+
+            data = self.fetch(url, params=query)
+            items_by_name: Dict[str, List[Dict[str, Any]]] = {}
+            for page in [data, *self._follow_next_links(data, fetch_page)]:
+                for item in page.get("Items", []):
+                    items_by_name.setdefault(item["Name"].lower(), []).append(item)
+            for name in chunk:
+                tag = escaped[name]
+                web_id = self._web_id_from_search(
+                    tag, {"Items": items_by_name.get(tag.lower(), [])}
+                )
+                if web_id:
+                    self._remember_web_id(tag, web_id)
+                web_ids[tag] = web_id
+        return web_ids
+
+    def _known_web_id(self, tag: str) -> Optional[str]:
+        """Returns the WebId of tag if it has been looked up before, or if it
+        can be generated from the path of the tag."""
+        if tag in self._web_ids:
+            return self._web_ids[tag]
+        if self.web_id_cache is not None and tag in self.web_id_cache:
+            self._web_ids[tag] = self.web_id_cache[tag]
+            return self._web_ids[tag]
+        if (
+            self._path_web_ids
+            and self.datasource is not None
+            and tag not in self._rejected_path_web_ids
+        ):
+            return self.generate_path_web_id(self.datasource, tag)
+        return None
+
+    @staticmethod
+    def generate_path_web_id(datasource: str, tag: str) -> str:
+        """Generates the PathOnly WebId 2.0 of a PI point from its path,
+        \\\\<datasource>\\<tag>, without asking the server."""
+        path = f"{datasource}\\{tag}".upper().encode("utf-8")
+        encoded = base64.urlsafe_b64encode(path).decode("ascii").rstrip("=")
+        return f"P1DP{encoded}"
+
+    def _reject_path_web_id(
+        self, tag: str, web_id: str, status_code: Optional[int]
+    ) -> bool:
+        """Checks whether the server rejected a generated path WebId. If so,
+        WebIds for tag are looked up by searching from now on."""
+        if (
+            status_code in (400, 404)
+            and self.datasource is not None
+            and web_id == self.generate_path_web_id(self.datasource, tag)
+            and tag not in self._web_ids
+        ):
+            logger.warning(f"Path WebId rejected for {tag}, searching instead")
+            self._rejected_path_web_ids.add(tag)
+            return True
+        return False
+
+    def _remember_web_id(self, tag: str, web_id: str) -> None:
+        self._web_ids[tag] = web_id
+        if self.web_id_cache is not None:
+            self.web_id_cache[tag] = web_id
+
+    @staticmethod
+    def _web_id_from_search(tag: str, data: Dict[str, Any]) -> Optional[str]:
+        """Returns the WebId of the single point found by a search for tag."""
         if len(data["Items"]) > 1:
             # Compare elements and if same, return the first
             first = data["Items"][0]
@@ -964,11 +2022,7 @@ class PIHandlerWeb(BaseHandlerWeb):
             logger.warning(f"Tag {tag} not found")
             return None
 
-        web_id = data["Items"][0]["WebId"]
-
-        if self.web_id_cache:
-            self.web_id_cache[tag] = web_id
-        return web_id
+        return data["Items"][0]["WebId"]
 
     @staticmethod
     def _is_summary(read_type: ReaderType) -> bool:
@@ -979,6 +2033,11 @@ class PIHandlerWeb(BaseHandlerWeb):
             ReaderType.RNG,
             ReaderType.STD,
             ReaderType.VAR,
+            ReaderType.COUNT,
+            ReaderType.GOOD,
+            ReaderType.BAD,
+            ReaderType.TOTAL,
+            ReaderType.SUM,
         ]:
             return True
         return False
@@ -992,6 +2051,8 @@ class PIHandlerWeb(BaseHandlerWeb):
         read_type: ReaderType,
         metadata: Optional[Dict[str, str]],
         get_status: bool = False,
+        max_rows: Optional[int] = None,
+        pixels: Optional[int] = None,
     ):
         web_id = self.tag_to_web_id(tag)
         if not web_id:
@@ -1005,64 +2066,171 @@ class PIHandlerWeb(BaseHandlerWeb):
             read_type=read_type,
             metadata={},
             get_status=get_status,
+            max_rows=max_rows,
+            pixels=pixels,
         )
         url = urljoin(self.base_url, url)
-        data = self.fetch(url, params=params)
+        try:
+            data = self.fetch(url, params=params, timeout=self.read_timeout)
+        except requests.exceptions.HTTPError as e:
+            if self._reject_path_web_id(tag, web_id, e.response.status_code):
+                return self.read_tag(
+                    tag=tag,
+                    start=start,
+                    end=end,
+                    sample_time=sample_time,
+                    read_type=read_type,
+                    metadata=metadata,
+                    get_status=get_status,
+                    max_rows=max_rows,
+                    pixels=pixels,
+                )
+            raise
+        return self._parse_stream_data(
+            data=data,
+            tag=tag,
+            start=start,
+            sample_time=sample_time,
+            read_type=read_type,
+            get_status=get_status,
+        )
 
+    @staticmethod
+    def _stream_items_to_frame(
+        items: List[Dict[str, Any]], summary: bool
+    ) -> pd.DataFrame:
+        """Collects the Timestamp, Value and status fields of the items in a
+        stream response into columns, one pass per field.
+
+        Summary data return each item under Value. DigitalSets return Value as
+        a dict with the Name and Value of the state.
+        """
+        if not items:
+            return pd.DataFrame()
+        if summary:
+            items = [item.get("Value", {}) for item in items]
+
+        values = [item.get("Value") for item in items]
+        states = sum(isinstance(value, dict) for value in values)
+        if states == len(values):
+            # Digital-set. Value.Name can also be the name of the digital-set,
+            # e.g. "Active", so only "No Data" is treated as invalid
+            values = [
+                np.nan if value.get("Name") == "No Data" else value.get("Value")
+                for value in values
+            ]
+        elif states > 0:
+            # Invalid data, returned as system digital states in numeric streams
+            values = [np.nan if isinstance(value, dict) else value for value in values]
+
+        columns = {
+            "Timestamp": [item.get("Timestamp") for item in items],
+            "Value": values,
+        }
+        for field in ["Good", "Questionable", "Substituted"]:
+            if field in items[0]:
+                columns[field] = [item.get(field) for item in items]
+        return pd.DataFrame(columns)
+
+    def read_tag_summaries(
+        self,
+        tag: str,
+        start: datetime,
+        end: datetime,
+        sample_time: timedelta,
+        read_types: List[ReaderType],
+        get_status: bool = False,
+    ) -> Dict[ReaderType, pd.DataFrame]:
+        """Reads several summary types for a tag in one request, by repeating
+        the summaryType parameter. Event weighted and time weighted summaries
+        are read in separate requests.
+
+        Returns a DataFrame per read type, formatted as returned by read_tag().
+        """
+        web_id = self.tag_to_web_id(tag)
+        if not web_id:
+            return {read_type: pd.DataFrame() for read_type in read_types}
+
+        groups: Dict[bool, List[ReaderType]] = {}
+        for read_type in read_types:
+            groups.setdefault(read_type in self._event_weighted, []).append(read_type)
+
+        result = {}
+        for group in groups.values():
+            url, params = self.generate_read_query(
+                tag=web_id,
+                start=start,
+                end=end,
+                sample_time=sample_time,
+                read_type=group[0],
+                metadata={},
+                get_status=get_status,
+            )
+            summary_types = {
+                read_type: [self._summary_types[read_type]]
+                + (["PercentGood"] if read_type in self._percent_good_types else [])
+                for read_type in group
+            }
+            params["summaryType"] = list(dict.fromkeys(sum(summary_types.values(), [])))
+            if "Items.Type" not in params["selectedFields"]:
+                params["selectedFields"] = params["selectedFields"].replace(
+                    "Links;", "Links;Items.Type;"
+                )
+            data = self.fetch(urljoin(self.base_url, url), params=params)
+
+            items_by_type: Dict[str, List[Dict[str, Any]]] = {}
+            for item in data.get("Items", []):
+                items_by_type.setdefault(item.get("Type"), []).append(item)
+            for read_type, types in summary_types.items():
+                result[read_type] = self._parse_stream_data(
+                    data={
+                        "Items": sum(
+                            [items_by_type.get(type_, []) for type_ in types], []
+                        )
+                    },
+                    tag=tag,
+                    start=start,
+                    sample_time=sample_time,
+                    read_type=read_type,
+                    get_status=get_status,
+                )
+        return {read_type: result[read_type] for read_type in read_types}
+
+    def _parse_stream_data(
+        self,
+        data: Dict[str, Any],
+        tag: str,
+        start: Optional[datetime],
+        sample_time: Optional[timedelta],
+        read_type: ReaderType,
+        get_status: bool,
+    ) -> pd.DataFrame:
+        """Parses the response for a single stream into a DataFrame."""
+        if read_type in self._percent_good_types:
+            return self._parse_event_counts(
+                data=data,
+                tag=tag,
+                start=start,
+                sample_time=sample_time,
+                read_type=read_type,
+                get_status=get_status,
+            )
         if read_type == ReaderType.SNAPSHOT:
             df = pd.DataFrame.from_dict([data])  # noqa
+            df = df.filter(
+                ["Timestamp", "Value", "Good", "Questionable", "Substituted"]
+            )
         else:
-            # Summary (aggregated) data and DigitalSets return Value as dict
-            df = pd.json_normalize(data=data, record_path="Items")
+            df = self._stream_items_to_frame(
+                data.get("Items", []), summary=self._is_summary(read_type)
+            )
 
         # Can happen for RAW reads w/o data in interval
         if df.empty:
             return df
 
-        # Summary data, digital-set or invalid data
-        if "Value" not in df.columns:
-            # Either digital-set or invalid data. Set invalid to NaN
-            if "Value.Name" in df.columns:
-                df.loc[df["Value.Name"] == "No Data", "Value.Value"] = np.nan
-            # Replaced below replacement test with above when adding get_status
-            # since we should avoid getting Good when get_status == False
-            # Value.Name can also be the name of the digital-set, e.g. "Active"
-            # Alternative: df["Value.IsSystem"] == True since it seems to be False
-            # for digital-sets?
-            #    df.loc[df.Good == False, "Value.Value"] = np.nan
-            df = df.rename(
-                columns={
-                    "Value.Value": "Value",
-                    "Value.Timestamp": "Timestamp",
-                    "Value.Good": "Good",
-                    "Value.Questionable": "Questionable",
-                    "Value.Substituted": "Substituted",
-                }
-            )
-
-        df = df.filter(["Timestamp", "Value", "Good", "Questionable", "Substituted"])
-
-        try:
-            # Could call this here, to support mixed format, but have not checked performance
-            # df["Timestamp"] = pd.to_datetime(df["Timestamp"], format='ISO8601', utc=True)
-            if read_type == ReaderType.RAW or read_type == ReaderType.SNAPSHOT:
-                # Sub-second timestamps are common
-                df["Timestamp"] = pd.to_datetime(
-                    df["Timestamp"], format="%Y-%m-%dT%H:%M:%S.%fZ", utc=True
-                )
-            else:
-                # Sub-second timestamps are uncommon
-                df["Timestamp"] = pd.to_datetime(
-                    df["Timestamp"], format="%Y-%m-%dT%H:%M:%SZ", utc=True
-                )
-        except ValueError:
-            try:
-                df["Timestamp"] = pd.to_datetime(df["Timestamp"], utc=True)
-            except ValueError:
-                #  Handle when both second and sub-second data is returned
-                df["Timestamp"] = pd.to_datetime(
-                    df["Timestamp"], format="ISO8601", utc=True
-                )
+        # Handles both second and sub-second data, also mixed
+        df["Timestamp"] = parse_utc_timestamps(df["Timestamp"])
 
         if read_type == ReaderType.VAR:
             df["Value"] = df["Value"] ** 2
@@ -1088,5 +2256,127 @@ class PIHandlerWeb(BaseHandlerWeb):
 
         return df.rename(columns={"Value": tag, "Status": tag + "::status"})
 
+    def _parse_event_counts(
+        self,
+        data: Dict[str, Any],
+        tag: str,
+        start: Optional[datetime],
+        sample_time: Optional[timedelta],
+        read_type: ReaderType,
+        get_status: bool,
+    ) -> pd.DataFrame:
+        """Parses a response holding both the Count and the PercentGood summary
+        into the number of events (COUNT) or bad events (BAD) per interval.
+
+        The count is unknown for intervals without any good events.
+        """
+        items = data.get("Items", [])
+        good = self._parse_stream_data(
+            data={"Items": [i for i in items if i.get("Type") != "PercentGood"]},
+            tag=tag,
+            start=start,
+            sample_time=sample_time,
+            read_type=ReaderType.GOOD,
+            get_status=get_status,
+        )
+        percent_good = self._parse_stream_data(
+            data={"Items": [i for i in items if i.get("Type") == "PercentGood"]},
+            tag=tag,
+            start=start,
+            sample_time=sample_time,
+            read_type=ReaderType.GOOD,
+            get_status=False,
+        )
+        if good.empty:
+            return good
+
+        percent_good = (
+            percent_good.reindex(good.index)
+            .get(tag, pd.Series(np.nan, index=good.index))
+            .replace(0, np.nan)
+        )
+        count = (good[tag] * 100 / percent_good).round()
+        good[tag] = count if read_type == ReaderType.COUNT else count - good[tag]
+        return good
+
+    def register_updates(self, tags: List[str]) -> Dict[str, str]:
+        """Registers the tags for stream updates.
+
+        Returns the marker of each tag that was registered. Pass the markers to
+        get_updates() to retrieve the events recorded since registration.
+        """
+        tags_by_web_id: Dict[str, List[str]] = {}
+        for tag, web_id in self.tags_to_web_ids(tags).items():
+            if web_id:
+                tags_by_web_id.setdefault(web_id, []).append(tag)
+
+        markers = {}
+        url = urljoin(self.base_url, "streamsets", "updates")
+        for web_ids in self._chunk_for_url(
+            list(tags_by_web_id), url=url, prefix="&webId="
+        ):
+            data = self.post(url, params={"webId": web_ids})
+            for item in data.get("Items", []):
+                for tag in tags_by_web_id.get(item.get("Source"), []):
+                    if item.get("Status") == "Succeeded":
+                        markers[tag] = item["LatestMarker"]
+                    else:
+                        logger.warning(
+                            f"Could not register {tag} for updates: "
+                            f"{item.get('Status')}"
+                        )
+        return markers
+
+    def get_updates(
+        self, markers: Dict[str, str], get_status: bool = False
+    ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+        """Retrieves the events recorded since the markers were issued.
+
+        Returns a DataFrame of events per tag, formatted as returned by
+        read_tag() for RAW reads, and the markers to use for the next
+        retrieval. Tags whose markers are no longer valid are left out of the
+        returned markers, and need to be registered again.
+        """
+        tags_by_marker = {marker: tag for tag, marker in markers.items()}
+        fields = ["Timestamp", "Value"]
+        if get_status:
+            fields += ["Good", "Questionable", "Substituted"]
+        selected_fields = ";".join(
+            ["Items.RequestedMarker", "Items.LatestMarker", "Items.Status"]
+            + [f"Items.Events.{field}" for field in fields]
+        )
+
+        result = {}
+        new_markers = {}
+        url = urljoin(self.base_url, "streamsets", "updates")
+        for chunk in self._chunk_for_url(
+            list(tags_by_marker),
+            url=url,
+            prefix="&marker=",
+            params={"selectedFields": selected_fields},
+        ):
+            data = self.fetch(
+                url, params={"marker": chunk, "selectedFields": selected_fields}
+            )
+            for item in data.get("Items", []):
+                tag = tags_by_marker.get(item.get("RequestedMarker"))
+                if tag is None:
+                    continue
+                if item.get("Status") != "Succeeded" or "LatestMarker" not in item:
+                    logger.warning(
+                        f"Could not get updates for {tag}: {item.get('Status')}"
+                    )
+                    continue
+                new_markers[tag] = item["LatestMarker"]
+                result[tag] = self._parse_stream_data(
+                    data={"Items": item.get("Events", [])},
+                    tag=tag,
+                    start=None,
+                    sample_time=None,
+                    read_type=ReaderType.RAW,
+                    get_status=get_status,
+                )
+        return result, new_markers
+
     def query_sql(self, query: str, parse: bool = True) -> pd.DataFrame:
         raise NotImplementedError
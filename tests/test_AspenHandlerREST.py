@@ -1,4 +1,6 @@
+import re
 from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
 
 import pytest
 
@@ -84,11 +86,11 @@ def test_generate_map_query(aspen_handler: AspenHandlerWeb) -> None:
         "AVG",
         "VAR",
         "STD",
-        # pytest.param("COUNT", 0, marks=pytest.mark.skip),
-        # pytest.param("GOOD", 0, marks=pytest.mark.skip),
-        # pytest.param("BAD", 0, marks=pytest.mark.skip),
-        # pytest.param("TOTAL", 0, marks=pytest.mark.skip),
-        # pytest.param("SUM", 0, marks=pytest.mark.skip),
+        "COUNT",
+        "GOOD",
+        "BAD",
+        "TOTAL",
+        "SUM",
         "SNAPSHOT",
     ],
 )
@@ -168,11 +170,46 @@ def test_generate_tag_read_query(
             "<RT>17</RT><O>0</O><S>0</S><P>60</P><PU>3</PU><AM>0</AM>"
             "<AS>0</AS><AA>0</AA><DSA>0</DSA></Tag></Q>"
         ),
-        "COUNT": "whatever",
-        "GOOD": "whatever",
-        "BAD": "whatever",
-        "TOTAL": "whatever",
-        "SUM": "whatever",
+        "COUNT": (
+            '<Q f="d" allQuotes="1"><Tag><N><![CDATA[ATCAI]]></N>'
+            "<D><![CDATA[source_name]]></D><F><![CDATA[VAL]]></F>"
+            "<HF>0</HF><St>1593010800000</St><Et>1593014400000</Et>"
+            "<RT>11</RT><O>0</O><S>0</S><P>60</P><PU>3</PU><AM>0</AM>"
+            "<AS>0</AS><AA>0</AA><DSA>0</DSA></Tag>"
+            "<Tag><N><![CDATA[ATCAI]]></N>"
+            "<D><![CDATA[source_name]]></D><F><![CDATA[VAL]]></F>"
+            "<HF>0</HF><St>1593010800000</St><Et>1593014400000</Et>"
+            "<RT>10</RT><O>0</O><S>0</S><P>60</P><PU>3</PU><AM>0</AM>"
+            "<AS>0</AS><AA>0</AA><DSA>0</DSA></Tag></Q>"
+        ),
+        "GOOD": (
+            '<Q f="d" allQuotes="1"><Tag><N><![CDATA[ATCAI]]></N>'
+            "<D><![CDATA[source_name]]></D><F><![CDATA[VAL]]></F>"
+            "<HF>0</HF><St>1593010800000</St><Et>1593014400000</Et>"
+            "<RT>11</RT><O>0</O><S>0</S><P>60</P><PU>3</PU><AM>0</AM>"
+            "<AS>0</AS><AA>0</AA><DSA>0</DSA></Tag></Q>"
+        ),
+        "BAD": (
+            '<Q f="d" allQuotes="1"><Tag><N><![CDATA[ATCAI]]></N>'
+            "<D><![CDATA[source_name]]></D><F><![CDATA[VAL]]></F>"
+            "<HF>0</HF><St>1593010800000</St><Et>1593014400000</Et>"
+            "<RT>10</RT><O>0</O><S>0</S><P>60</P><PU>3</PU><AM>0</AM>"
+            "<AS>0</AS><AA>0</AA><DSA>0</DSA></Tag></Q>"
+        ),
+        "TOTAL": (
+            '<Q f="d" allQuotes="1"><Tag><N><![CDATA[ATCAI]]></N>'
+            "<D><![CDATA[source_name]]></D><F><![CDATA[VAL]]></F>"
+            "<HF>0</HF><St>1593010800000</St><Et>1593014400000</Et>"
+            "<RT>12</RT><O>0</O><S>0</S><P>60</P><PU>3</PU><AM>0</AM>"
+            "<AS>0</AS><AA>0</AA><DSA>0</DSA></Tag></Q>"
+        ),
+        "SUM": (
+            '<Q f="d" allQuotes="1"><Tag><N><![CDATA[ATCAI]]></N>'
+            "<D><![CDATA[source_name]]></D><F><![CDATA[VAL]]></F>"
+            "<HF>0</HF><St>1593010800000</St><Et>1593014400000</Et>"
+            "<RT>16</RT><O>0</O><S>0</S><P>60</P><PU>3</PU><AM>0</AM>"
+            "<AS>0</AS><AA>0</AA><DSA>0</DSA></Tag></Q>"
+        ),
         "SNAPSHOT": (
             '<Q f="d" allQuotes="1" rt="1593014400000" uc="0">'
             "<Tag><N><![CDATA[ATCAI]]></N>"
@@ -207,6 +244,27 @@ def test_generate_read_query_long_sample_time(aspen_handler: AspenHandlerWeb) ->
     assert expected == res
 
 
+def test_generate_read_query_pixels(aspen_handler: AspenHandlerWeb) -> None:
+    start = utils.ensure_datetime_with_tz("2020-06-24 17:00:00")
+    end = utils.ensure_datetime_with_tz("2020-06-24 18:00:00")
+    queries = {
+        read_type: aspen_handler.generate_read_query(
+            tagname="ATCAI",
+            mapname=None,
+            start=start,
+            end=end,
+            sample_time=None,
+            read_type=read_type,
+            metadata={},
+            max_rows=5000,
+            pixels=800,
+        )
+        for read_type in [ReaderType.RAW, ReaderType.SHAPEPRESERVING]
+    }
+    assert "<X>5000</X>" in queries[ReaderType.RAW]
+    assert "<X>800</X>" in queries[ReaderType.SHAPEPRESERVING]
+
+
 def test_generate_sql_query(aspen_handler: AspenHandlerWeb) -> None:
     res = aspen_handler.generate_sql_query(
         datasource=None,
@@ -232,3 +290,270 @@ def test_generate_sql_query(aspen_handler: AspenHandlerWeb) -> None:
         "<![CDATA[myquery]]></SQL>"
     )
     assert res == expected
+
+
+def test_generate_multi_read_queries(aspen_handler: AspenHandlerWeb) -> None:
+    end = utils.ensure_datetime_with_tz("2020-06-24 18:00:00")
+    queries = aspen_handler.generate_multi_read_queries(
+        tags=["ATCAI", "ATCMIXTIME1;IP_INPUT_VALUE"],
+        start=None,
+        end=end,
+        sample_time=None,
+        read_type=ReaderType.SNAPSHOT,
+    )
+    assert queries == [
+        (
+            ["ATCAI", "ATCMIXTIME1;IP_INPUT_VALUE"],
+            '<Q f="d" allQuotes="1" rt="1593014400000" uc="0">'
+            "<Tag><N><![CDATA[ATCAI]]></N>"
+            "<D><![CDATA[source_name]]></D><F><![CDATA[VAL]]></F>"
+            "<VS>1</VS><S>0</S></Tag>"
+            "<Tag><N><![CDATA[ATCMIXTIME1]]></N><M><![CDATA[IP_INPUT_VALUE]]></M>"
+            "<D><![CDATA[source_name]]></D><F><![CDATA[VAL]]></F>"
+            "<VS>1</VS><S>0</S></Tag></Q>",
+        )
+    ]
+
+    aspen_handler._max_tags_per_request = 2
+    queries = aspen_handler.generate_multi_read_queries(
+        tags=["A", "B", "C"],
+        start=None,
+        end=end,
+        sample_time=None,
+        read_type=ReaderType.SNAPSHOT,
+    )
+    assert [chunk for chunk, _ in queries] == [["A", "B"], ["C"]]
+    assert all(query.count("<Tag>") == len(chunk) for chunk, query in queries)
+
+
+def test_read_tags_snapshot(
+    aspen_handler: AspenHandlerWeb, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fetch(url: str, params: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        assert url.endswith("/Attribute")
+        return {
+            "data": [
+                {"samples": [{"t": 1593014400000, "v": 1.5, "l": 0, "s": 8, "V": 1}]},
+                {"samples": [{"er": 1, "es": "Tag not found"}]},
+            ]
+        }
+
+    monkeypatch.setattr(aspen_handler, "fetch", fetch)
+    frames = aspen_handler.read_tags(
+        tags=["ATCAI", "MISSING"],
+        start=None,
+        end=None,
+        sample_time=None,
+        read_type=ReaderType.SNAPSHOT,
+        get_status=True,
+    )
+    assert frames["ATCAI"]["ATCAI"].tolist() == [1.5]
+    assert frames["ATCAI"]["ATCAI::status"].tolist() == [0]
+    assert str(frames["ATCAI"].index[0]) == "2020-06-24 16:00:00+00:00"
+    assert frames["MISSING"].empty
+
+
+def test_read_tag_counts_and_totals(
+    aspen_handler: AspenHandlerWeb, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def sample(value: float) -> Dict[str, Any]:
+        return {"t": 1593010800000, "v": value, "l": 0, "s": 8, "V": 1}
+
+    def fetch(url: str, params: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        if "<RT>12</RT>" in params:
+            return {"data": [{"samples": [sample(48.0)]}]}
+        # Good and bad events of the same tag, in query order
+        return {"data": [{"samples": [sample(7)]}, {"samples": [sample(3)]}]}
+
+    monkeypatch.setattr(aspen_handler, "fetch", fetch)
+    start = utils.ensure_datetime_with_tz("2020-06-24 17:00:00")
+    end = utils.ensure_datetime_with_tz("2020-06-24 18:00:00")
+    kwargs = dict(tag="ATCAI", start=start, end=end, metadata=None)
+    count = aspen_handler.read_tag(
+        sample_time=SAMPLE_TIME, read_type=ReaderType.COUNT, **kwargs
+    )
+    assert count["ATCAI"].tolist() == [10]
+    total = aspen_handler.read_tag(
+        sample_time=timedelta(hours=6), read_type=ReaderType.TOTAL, **kwargs
+    )
+    assert total["ATCAI"].tolist() == [12.0]
+
+
+def test_read_tags_history(
+    aspen_handler: AspenHandlerWeb, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    queries = []
+
+    def fetch(url: str, params: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        assert url.endswith("/History")
+        queries.append(params)
+        samples = [
+            {"t": 1593010800000 + i * 60000, "v": float(i), "l": 0, "s": 8, "V": 1}
+            for i in range(61)
+        ]
+        return {"data": [{"samples": samples}] * params.count("<Tag>")}
+
+    monkeypatch.setattr(aspen_handler, "fetch", fetch)
+    aspen_handler._max_rows = 250
+    tags = ["A", "B;MAP", "C"]
+    frames = aspen_handler.read_tags(
+        tags=tags,
+        start=utils.ensure_datetime_with_tz("2020-06-24 17:00:00"),
+        end=utils.ensure_datetime_with_tz("2020-06-24 18:00:00"),
+        sample_time=SAMPLE_TIME,
+        read_type=ReaderType.COUNT,
+    )
+    # 61 rows per tag, counted twice for COUNT, leaves room for two tags per query
+    assert [query.count("<N>") for query in queries] == [4, 2]
+    assert "<M><![CDATA[MAP]]></M>" in queries[0]
+    assert list(frames) == tags
+    # Good and bad events are added for each tag
+    assert all(frames[tag][tag].iloc[-1] == 120.0 for tag in tags)
+    assert all(len(frames[tag]) == 61 for tag in tags)
+
+
+def test_search_reads_descriptions_in_batches(
+    aspen_handler: AspenHandlerWeb, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    tagnames = [f"ATC{i:03d}" for i in range(25)]
+    taginfo_queries = []
+
+    def fetch(url: str, params: Optional[str] = None, **kwargs: Any) -> Dict:
+        if "Browse" in url:
+            return {"data": {"tags": [{"t": tagname} for tagname in tagnames]}}
+        taginfo_queries.append(params)
+        names = re.findall(r"<N><!\[CDATA\[(.*?)\]\]></N>", params)
+        return {
+            "data": {
+                "tags": [
+                    {"attrData": [{"samples": [{"v": f"Description of {name}"}]}]}
+                    for name in names
+                ]
+            }
+        }
+
+    monkeypatch.setattr(aspen_handler, "fetch", fetch)
+    res = aspen_handler.search(tag="ATC*", desc="*of ATC01*")
+    assert res == [(f"ATC{i:03d}", f"Description of ATC{i:03d}") for i in range(10, 20)]
+    assert 1 < len(taginfo_queries) < len(tagnames)
+
+
+def test_read_tag_follows_moredata_token(
+    aspen_handler: AspenHandlerWeb, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    queries = []
+
+    def fetch(url: str, params: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        queries.append(params)
+        page = len(queries) - 1
+        timestamps = [1593010800000 + (page * 3 + i) * 60000 for i in range(3)]
+        samples = [{"t": t, "v": 1.0, "l": 0, "s": 8, "V": 1} for t in timestamps]
+        item: Dict[str, Any] = {"samples": samples}
+        if page < 2:
+            item["moredata"] = f"token{page}"
+        return {"data": [item]}
+
+    monkeypatch.setattr(aspen_handler, "fetch", fetch)
+    df = aspen_handler.read_tag(
+        tag="ATCAI",
+        start=utils.ensure_datetime_with_tz("2020-06-24 17:00:00"),
+        end=utils.ensure_datetime_with_tz("2020-06-24 18:00:00"),
+        sample_time=SAMPLE_TIME,
+        read_type=ReaderType.AVG,
+        metadata=None,
+    )
+    assert len(queries) == 3
+    assert "<MD>" not in queries[0]
+    assert queries[1] == queries[0].replace(
+        "</Tag>", "<MD><![CDATA[token0]]></MD></Tag>"
+    )
+    assert "<![CDATA[token1]]>" in queries[2]
+    assert len(df) == 9
+    assert df.index.is_unique
+
+
+START = utils.ensure_datetime_with_tz("2020-06-24 17:00:00")
+END = utils.ensure_datetime_with_tz("2020-06-24 18:00:00")
+ROWS = int((END - START) / SAMPLE_TIME) + 1
+
+
+def truncating_fetch(
+    aspen_handler: AspenHandlerWeb, queries: List[str]
+) -> Callable[..., Dict[str, Any]]:
+    """Returns a fake fetch that truncates each query to the aggregate cap,
+    split evenly over its <Tag> elements, and returns a moredata token for
+    the rest of the ROWS rows of each element."""
+
+    def fetch(url: str, params: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        queries.append(params)
+        elements = re.findall(r"<Tag>.*?</Tag>", params)
+        per_element = aspen_handler._max_aggregate_rows // len(elements)
+        items = []
+        for element in elements:
+            token = re.search(r"<MD><!\[CDATA\[(\d+)\]\]></MD>", element)
+            offset = int(token.group(1)) if token else 0
+            count = min(per_element, ROWS - offset)
+            samples = [
+                {"t": 1593010800000 + i * 60000, "v": 1.0, "l": 0, "s": 8, "V": 1}
+                for i in range(offset, offset + count)
+            ]
+            item: Dict[str, Any] = {"samples": samples}
+            if offset + count < ROWS:
+                item["moredata"] = str(offset + count)
+            items.append(item)
+        return {"data": items}
+
+    return fetch
+
+
+@pytest.mark.parametrize("read_type", ["AVG", "COUNT"])  # type: ignore[misc]
+def test_read_tag_follows_moredata_tokens_of_each_element(
+    aspen_handler: AspenHandlerWeb,
+    monkeypatch: pytest.MonkeyPatch,
+    read_type: str,
+) -> None:
+    queries: List[str] = []
+    monkeypatch.setattr(
+        aspen_handler, "fetch", truncating_fetch(aspen_handler, queries)
+    )
+    aspen_handler._max_aggregate_rows = 50
+    df = aspen_handler.read_tag(
+        tag="ATCAI",
+        start=START,
+        end=END,
+        sample_time=SAMPLE_TIME,
+        read_type=getattr(ReaderType, read_type),
+        metadata=None,
+    )
+    assert len(queries) > 1
+    assert len(df) == ROWS
+    assert df.index.is_unique
+    # COUNT adds the good and the bad events
+    expected = 2.0 if read_type == "COUNT" else 1.0
+    assert (df["ATCAI"] == expected).all()
+
+
+def test_read_tags_follows_moredata_tokens(
+    aspen_handler: AspenHandlerWeb, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    queries: List[str] = []
+    monkeypatch.setattr(
+        aspen_handler, "fetch", truncating_fetch(aspen_handler, queries)
+    )
+    aspen_handler._max_aggregate_rows = 50
+    tags = ["A", "B"]
+    frames = aspen_handler.read_tags(
+        tags=tags,
+        start=START,
+        end=END,
+        sample_time=SAMPLE_TIME,
+        read_type=ReaderType.COUNT,
+    )
+    # 61 rows per tag, counted twice for COUNT, exceed the cap of one query
+    assert all(query.count("<N>") == 2 for query in queries)
+    assert len(queries) > len(tags)
+    for tag in tags:
+        assert len(frames[tag]) == ROWS
+        assert frames[tag].index.is_unique
+        # Good and bad events are added for each tag
+        assert (frames[tag][tag] == 2.0).all()
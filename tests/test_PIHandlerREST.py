@@ -1,7 +1,10 @@
 from datetime import timedelta
-from typing import Generator, cast
+from typing import Any, Dict, Generator, List, Optional, Tuple, cast
 
+import numpy as np
+import pandas as pd
 import pytest
+import requests
 
 from tagreader.cache import SmartCache
 from tagreader.utils import ReaderType, ensure_datetime_with_tz
@@ -65,11 +68,14 @@ def test_is_summary(pi_handler: PIHandlerWeb) -> None:
     assert pi_handler._is_summary(ReaderType.RNG)
     assert pi_handler._is_summary(ReaderType.STD)
     assert pi_handler._is_summary(ReaderType.VAR)
+    assert pi_handler._is_summary(ReaderType.COUNT)
+    assert pi_handler._is_summary(ReaderType.GOOD)
+    assert pi_handler._is_summary(ReaderType.BAD)
+    assert pi_handler._is_summary(ReaderType.TOTAL)
+    assert pi_handler._is_summary(ReaderType.SUM)
     assert not pi_handler._is_summary(ReaderType.RAW)
     assert not pi_handler._is_summary(ReaderType.SHAPEPRESERVING)
     assert not pi_handler._is_summary(ReaderType.INT)
-    assert not pi_handler._is_summary(ReaderType.GOOD)
-    assert not pi_handler._is_summary(ReaderType.BAD)
     assert not pi_handler._is_summary(ReaderType.SNAPSHOT)
 
 
@@ -77,9 +83,7 @@ def test_is_summary(pi_handler: PIHandlerWeb) -> None:
     "read_type",
     [
         "RAW",
-        # pytest.param(
-        #     "SHAPEPRESERVING", marks=pytest.mark.skip(reason="Not implemented")
-        # ),
+        "SHAPEPRESERVING",
         "INT",
         "MIN",
         "MAX",
@@ -87,11 +91,11 @@ def test_is_summary(pi_handler: PIHandlerWeb) -> None:
         "AVG",
         "STD",
         "VAR",
-        # pytest.param("COUNT", marks=pytest.mark.skip(reason="Not implemented")),
-        # pytest.param("GOOD", marks=pytest.mark.skip(reason="Not implemented")),
-        # pytest.param("BAD", marks=pytest.mark.skip(reason="Not implemented")),
-        # pytest.param("TOTAL", marks=pytest.mark.skip(reason="Not implemented")),
-        # pytest.param("SUM", marks=pytest.mark.skip(reason="Not implemented")),
+        "COUNT",
+        "GOOD",
+        "BAD",
+        "TOTAL",
+        "SUM",
         "SNAPSHOT",
     ],
 )
@@ -135,6 +139,23 @@ def test_generate_read_query(pi_handler: PIHandlerWeb, read_type: str) -> None:
             "VAR": "StdDev",
         }.get(read_type) == params["summaryType"]
         assert params["summaryDuration"] == f"{SAMPLE_TIME}s"
+    elif read_type in ["COUNT", "GOOD", "BAD", "TOTAL", "SUM"]:
+        assert url == f"streams/{pi_handler.web_id_cache['alreadyknowntag']}/summary"
+        assert {
+            "COUNT": ["Count", "PercentGood"],
+            "GOOD": "Count",
+            "BAD": ["Count", "PercentGood"],
+            "TOTAL": "Total",
+            "SUM": "Total",
+        }.get(read_type) == params["summaryType"]
+        assert params.get("calculationBasis") == (
+            None if read_type == "TOTAL" else "EventWeighted"
+        )
+        assert params["selectedFields"] == (
+            "Links;Items.Type;Items.Value.Timestamp;Items.Value.Value"
+            if read_type in ["COUNT", "BAD"]
+            else "Links;Items.Value.Timestamp;Items.Value.Value"
+        )
     elif read_type == "SNAPSHOT":
         assert url == f"streams/{pi_handler.web_id_cache['alreadyknowntag']}/value"
         assert params["selectedFields"] == "Timestamp;Value"
@@ -143,15 +164,17 @@ def test_generate_read_query(pi_handler: PIHandlerWeb, read_type: str) -> None:
         assert url == f"streams/{pi_handler.web_id_cache['alreadyknowntag']}/recorded"
         assert params["selectedFields"] == "Links;Items.Timestamp;Items.Value"
         assert params["maxCount"] == 10000  # type: ignore[comparison-overlap]
+    elif read_type == "SHAPEPRESERVING":
+        assert url == f"streams/{pi_handler.web_id_cache['alreadyknowntag']}/plot"
+        assert params["selectedFields"] == "Links;Items.Timestamp;Items.Value"
+        assert params["intervals"] == 10000  # type: ignore[comparison-overlap]
 
 
 @pytest.mark.parametrize(  # type: ignore[misc]
     "read_type",
     [
         "RAW",
-        # pytest.param(
-        #     "SHAPEPRESERVING", marks=pytest.mark.skip(reason="Not implemented")
-        # ),
+        "SHAPEPRESERVING",
         "INT",
         "MIN",
         "MAX",
@@ -159,11 +182,11 @@ def test_generate_read_query(pi_handler: PIHandlerWeb, read_type: str) -> None:
         "AVG",
         "STD",
         "VAR",
-        # pytest.param("COUNT", marks=pytest.mark.skip(reason="Not implemented")),
-        # pytest.param("GOOD", marks=pytest.mark.skip(reason="Not implemented")),
-        # pytest.param("BAD", marks=pytest.mark.skip(reason="Not implemented")),
-        # pytest.param("TOTAL", marks=pytest.mark.skip(reason="Not implemented")),
-        # pytest.param("SUM", marks=pytest.mark.skip(reason="Not implemented")),
+        "COUNT",
+        "GOOD",
+        "BAD",
+        "TOTAL",
+        "SUM",
         "SNAPSHOT",
     ],
 )
@@ -227,6 +250,12 @@ def test_generate_read_query_with_status(
             "Items.Good;Items.Questionable;Items.Substituted"
         )
         assert params["maxCount"] == 10000  # type: ignore[comparison-overlap]
+    elif read_type == "SHAPEPRESERVING":
+        assert url == f"streams/{pi_handler.web_id_cache['alreadyknowntag']}/plot"
+        assert params["selectedFields"] == (
+            "Links;Items.Timestamp;Items.Value;"
+            "Items.Good;Items.Questionable;Items.Substituted"
+        )
 
 
 def test_generate_read_query_long_sample_time(pi_handler: PIHandlerWeb) -> None:
@@ -243,3 +272,683 @@ def test_generate_read_query_long_sample_time(pi_handler: PIHandlerWeb) -> None:
         metadata=None,
     )
     assert params["interval"] == f"{86410}s"
+
+
+def test_generate_read_query_pixels(pi_handler: PIHandlerWeb) -> None:
+    start = ensure_datetime_with_tz(START_TIME)
+    stop = ensure_datetime_with_tz(STOP_TIME)
+    url, params = pi_handler.generate_read_query(
+        tag=pi_handler.tag_to_web_id("alreadyknowntag"),  # type: ignore[arg-type]
+        start=start,
+        end=stop,
+        # The sample time is not used for shape preserving reads
+        sample_time=None,
+        read_type=ReaderType.SHAPEPRESERVING,
+        metadata=None,
+        max_rows=5000,
+        pixels=800,
+    )
+    assert url.endswith("/plot")
+    assert params["intervals"] == 800  # type: ignore[comparison-overlap]
+    assert "maxCount" not in params
+
+
+def test_generate_multi_read_query(pi_handler: PIHandlerWeb) -> None:
+    start = ensure_datetime_with_tz(START_TIME)
+    stop = ensure_datetime_with_tz(STOP_TIME)
+    ts = timedelta(seconds=SAMPLE_TIME)
+
+    url, params = pi_handler.generate_multi_read_query(
+        web_ids=["webid1", "webid2"],
+        start=start,
+        end=stop,
+        sample_time=ts,
+        read_type=ReaderType.AVG,
+        get_status=True,
+    )
+    assert url == "streamsets/summary"
+    assert params["webId"] == ["webid1", "webid2"]
+    assert params["summaryType"] == "Average"
+    assert params["selectedFields"] == (
+        "Items.WebId;Items.Items.Value.Timestamp;Items.Items.Value.Value;"
+        "Items.Items.Value.Good;Items.Items.Value.Questionable;"
+        "Items.Items.Value.Substituted"
+    )
+
+    url, params = pi_handler.generate_multi_read_query(
+        web_ids=["webid1"],
+        start=start,
+        end=stop,
+        sample_time=ts,
+        read_type=ReaderType.INT,
+    )
+    assert url == "streamsets/interpolated"
+    assert (
+        params["selectedFields"]
+        == "Items.WebId;Items.Items.Timestamp;Items.Items.Value"
+    )
+
+
+def test_chunk_for_url(pi_handler: PIHandlerWeb) -> None:
+    pi_handler._max_tags_per_request = 3
+    assert pi_handler._chunk_for_url(
+        ["a", "b", "c", "d"], url="x", prefix="&webId="
+    ) == [
+        ["a", "b", "c"],
+        ["d"],
+    ]
+    pi_handler._max_url_length = len("x") + 2 * len("&webId=a")
+    assert pi_handler._chunk_for_url(
+        ["a", "b", "c", "d"], url="x", prefix="&webId="
+    ) == [
+        ["a", "b"],
+        ["c", "d"],
+    ]
+    # The other query parameters take up room in each request
+    assert pi_handler._chunk_for_url(
+        ["a", "b", "c", "d"], url="x", prefix="&webId=", params={"y": ""}
+    ) == [["a"], ["b"], ["c"], ["d"]]
+
+
+def test_read_tags_splits_streamset_response(
+    pi_handler: PIHandlerWeb, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pi_handler.web_id_cache.add(key="othertag", value="otherwebid")  # type: ignore[union-attr]
+    requests: List[Tuple[str, Dict[str, Any]]] = []
+
+    def fetch(
+        url: str, params: Dict[str, Any], timeout: Optional[int] = None
+    ) -> Dict[str, Any]:
+        requests.append((url, params))
+        return {
+            "Items": [
+                {
+                    "WebId": web_id,
+                    "Items": [
+                        {"Timestamp": "2020-04-01T09:05:00Z", "Value": i},
+                        {"Timestamp": "2020-04-01T09:06:00Z", "Value": i + 0.5},
+                    ],
+                }
+                for i, web_id in enumerate(params["webId"])
+            ]
+        }
+
+    monkeypatch.setattr(pi_handler, "fetch", fetch)
+    frames = pi_handler.read_tags(
+        tags=["alreadyknowntag", "othertag"],
+        start=ensure_datetime_with_tz(START_TIME),
+        end=ensure_datetime_with_tz(STOP_TIME),
+        sample_time=timedelta(seconds=SAMPLE_TIME),
+        read_type=ReaderType.INT,
+    )
+    assert len(requests) == 1
+    assert requests[0][0].endswith("streamsets/interpolated")
+    assert list(frames["alreadyknowntag"]["alreadyknowntag"]) == [0, 0.5]
+    assert list(frames["othertag"]["othertag"]) == [1, 1.5]
+    assert str(frames["othertag"].index[0]) == "2020-04-01 09:05:00+00:00"
+
+
+def test_read_tags_keeps_urls_below_max_length(
+    pi_handler: PIHandlerWeb, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pi_handler._max_url_length = 1000
+    web_ids = {f"tag{i}": f"P1DPwebid{i:04d}" for i in range(60)}
+    for tag, web_id in web_ids.items():
+        pi_handler.web_id_cache.add(key=tag, value=web_id)  # type: ignore[union-attr]
+    urls = []
+
+    def fetch(
+        url: str, params: Dict[str, Any], timeout: Optional[int] = None
+    ) -> Dict[str, Any]:
+        urls.append(requests.Request("GET", url, params=params).prepare().url)
+        return {"Items": []}
+
+    monkeypatch.setattr(pi_handler, "fetch", fetch)
+    pi_handler.read_tags(
+        tags=list(web_ids),
+        start=ensure_datetime_with_tz(START_TIME),
+        end=ensure_datetime_with_tz(STOP_TIME),
+        sample_time=timedelta(seconds=SAMPLE_TIME),
+        read_type=ReaderType.AVG,
+        get_status=True,
+    )
+    assert len(urls) > 1
+    assert all(len(url) <= pi_handler._max_url_length for url in urls)
+
+
+def test_read_tags_keeps_values_below_max_items_per_call(
+    pi_handler: PIHandlerWeb, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    web_ids = {f"tag{i}": f"P1DPwebid{i:04d}" for i in range(5)}
+    for tag, web_id in web_ids.items():
+        pi_handler.web_id_cache.add(key=tag, value=web_id)  # type: ignore[union-attr]
+    requests_web_ids = []
+
+    def fetch(
+        url: str, params: Dict[str, Any], timeout: Optional[int] = None
+    ) -> Dict[str, Any]:
+        requests_web_ids.append(params["webId"])
+        return {"Items": []}
+
+    monkeypatch.setattr(pi_handler, "fetch", fetch)
+    # 61 intervals with two values each, for the count and PercentGood
+    pi_handler._max_items_per_call = 250
+    pi_handler.read_tags(
+        tags=list(web_ids),
+        start=ensure_datetime_with_tz(START_TIME),
+        end=ensure_datetime_with_tz(STOP_TIME),
+        sample_time=timedelta(seconds=SAMPLE_TIME),
+        read_type=ReaderType.COUNT,
+    )
+    assert [len(ids) for ids in requests_web_ids] == [2, 2, 1]
+
+
+def test_generate_batch_read_request(pi_handler: PIHandlerWeb) -> None:
+    pi_handler.datasource = None
+    batch = pi_handler.generate_batch_read_request(
+        tags=["alreadyknowntag", "unknowntag"],
+        start=ensure_datetime_with_tz(START_TIME),
+        end=ensure_datetime_with_tz(STOP_TIME),
+        sample_time=timedelta(seconds=SAMPLE_TIME),
+        read_type=ReaderType.INT,
+    )
+    assert sorted(batch) == ["read_0", "read_1", "search_1"]
+    assert batch["read_0"]["Resource"].startswith(
+        f"{pi_handler.base_url}/streams/knownwebid/interpolated?"
+    )
+    assert "ParentIds" not in batch["read_0"]
+    assert batch["search_1"]["Resource"] == (
+        f"{pi_handler.base_url}/points/search?query=name%3Aunknowntag"
+    )
+    assert batch["read_1"]["Resource"].startswith(
+        f"{pi_handler.base_url}/streams/{{0}}/interpolated?"
+    )
+    assert batch["read_1"]["ParentIds"] == ["search_1"]
+    assert batch["read_1"]["Parameters"] == ["$.search_1.Content.Items[0].WebId"]
+
+
+def test_generate_batch_read_request_count(pi_handler: PIHandlerWeb) -> None:
+    batch = pi_handler.generate_batch_read_request(
+        tags=["alreadyknowntag"],
+        start=ensure_datetime_with_tz(START_TIME),
+        end=ensure_datetime_with_tz(STOP_TIME),
+        sample_time=timedelta(seconds=SAMPLE_TIME),
+        read_type=ReaderType.COUNT,
+    )
+    resource = batch["read_0"]["Resource"]
+    assert resource.startswith(f"{pi_handler.base_url}/streams/knownwebid/summary?")
+    assert "summaryType=Count&summaryType=PercentGood" in resource
+
+
+def test_read_tags_batch(
+    pi_handler: PIHandlerWeb, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pi_handler.datasource = None
+    items = {"Items": [{"Timestamp": "2020-04-01T09:05:00Z", "Value": 1.5}]}
+    responses = {
+        "read_0": {"Status": 200, "Content": items},
+        "search_1": {"Status": 200, "Content": {"Items": [{"WebId": "newwebid"}]}},
+        "read_1": {"Status": 200, "Content": items},
+        "search_2": {"Status": 200, "Content": {"Items": []}},
+        "read_2": {"Status": 409, "Content": "Parent failed"},
+    }
+    posts = []
+
+    def post(url: str, data: Dict[str, Any], timeout: Optional[int] = None) -> Dict:
+        posts.append(url)
+        return {key: responses[key] for key in data}
+
+    monkeypatch.setattr(pi_handler, "post", post)
+    frames = pi_handler.read_tags_batch(
+        tags=["alreadyknowntag", "newtag", "missingtag"],
+        start=ensure_datetime_with_tz(START_TIME),
+        end=ensure_datetime_with_tz(STOP_TIME),
+        sample_time=timedelta(seconds=SAMPLE_TIME),
+        read_type=ReaderType.INT,
+    )
+    assert posts == [f"{pi_handler.base_url}/batch"]
+    assert list(frames["alreadyknowntag"]["alreadyknowntag"]) == [1.5]
+    assert list(frames["newtag"]["newtag"]) == [1.5]
+    assert frames["missingtag"].empty
+    assert pi_handler.web_id_cache["newtag"] == "newwebid"  # type: ignore[index]
+    assert "missingtag" not in pi_handler.web_id_cache  # type: ignore[operator]
+
+
+def test_tags_to_web_ids(
+    pi_handler: PIHandlerWeb, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pi_handler.datasource = None
+    searches = []
+
+    def fetch(url: str, params: Dict[str, Any], timeout: Optional[int] = None) -> Dict:
+        searches.append(params["query"])
+        return {
+            "Items": [
+                {"Name": "TAG:1", "WebId": "webid1"},
+                {"Name": "tag2", "WebId": "webid2"},
+            ]
+        }
+
+    monkeypatch.setattr(pi_handler, "fetch", fetch)
+    web_ids = pi_handler.tags_to_web_ids(
+        ["alreadyknowntag", "tag:1", "tag2", "missingtag"]
+    )
+    assert searches == [r"name:tag\:1 OR name:tag2 OR name:missingtag"]
+    assert web_ids == {
+        "alreadyknowntag": "knownwebid",
+        "tag:1": "webid1",
+        "tag2": "webid2",
+        "missingtag": None,
+    }
+    assert pi_handler.web_id_cache["tag:1"] == "webid1"  # type: ignore[index]
+
+    # Known tags are not searched for again
+    pi_handler.tags_to_web_ids(["tag:1", "tag2"])
+    assert len(searches) == 1
+
+
+def test_tags_to_web_ids_follows_next_links(
+    pi_handler: PIHandlerWeb, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pi_handler.datasource = None
+    tags = [f"tag{i}" for i in range(5)]
+    starts = []
+
+    def fetch(url: str, params: Dict[str, Any], timeout: Optional[int] = None) -> Dict:
+        # The server caps the page size at two items
+        assert params["count"] >= len(tags)
+        start = params.get("start", 0)
+        starts.append(start)
+        data: Dict[str, Any] = {
+            "Items": [
+                {"Name": tag, "WebId": f"webid_{tag}"}
+                for tag in tags[start : start + 2]
+            ],
+            "Links": {},
+        }
+        if start + 2 < len(tags):
+            data["Links"]["Next"] = f"{url}?start={start + 2}&count=2"
+        return data
+
+    monkeypatch.setattr(pi_handler, "fetch", fetch)
+    web_ids = pi_handler.tags_to_web_ids(tags)
+    assert starts == [0, 2, 4]
+    assert web_ids == {tag: f"webid_{tag}" for tag in tags}
+
+
+def test_web_ids_are_stored_in_empty_cache(
+    pi_handler: PIHandlerWeb, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pi_handler.datasource = None
+    pi_handler.web_id_cache.clear()  # type: ignore[union-attr]
+    monkeypatch.setattr(
+        pi_handler,
+        "fetch",
+        lambda url, params: {"Items": [{"Name": "tag", "WebId": "webid"}]},
+    )
+    assert pi_handler.tag_to_web_id("tag") == "webid"
+    assert pi_handler.web_id_cache["tag"] == "webid"  # type: ignore[index]
+
+
+def test_dataserver_web_id_is_looked_up_once(
+    pi_handler: PIHandlerWeb, cache: SmartCache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    requests = []
+
+    def fetch(url: str, params: Any = None, timeout: Optional[int] = None) -> Dict:
+        requests.append(url)
+        return {
+            "Items": [
+                {"Name": "othersource", "WebId": "otherserverwebid"},
+                {"Name": "sourcename", "WebId": "serverwebid"},
+            ]
+        }
+
+    monkeypatch.setattr(pi_handler, "fetch", fetch)
+    assert pi_handler.dataserver_web_id == "serverwebid"
+    assert pi_handler.dataserver_web_id == "serverwebid"
+    assert requests == [f"{pi_handler.base_url}/dataservers"]
+    assert PIHandlerWeb.generate_search_params(
+        tag="tag",
+        desc=None,
+        datasource="sourcename",
+        dataserver_web_id=pi_handler.dataserver_web_id,
+    ) == {"query": "name:tag", "dataserverwebid": "serverwebid"}
+
+    # A new handler finds the WebId in the cache
+    other_handler = PIHandlerWeb(
+        datasource="sourcename",
+        auth=None,
+        options={},
+        url=None,
+        verify_ssl=True,
+        cache=cache,
+    )
+    monkeypatch.setattr(other_handler, "fetch", fetch)
+    assert other_handler.dataserver_web_id == "serverwebid"
+    assert len(requests) == 1
+
+
+def test_generate_path_web_id() -> None:
+    assert (
+        PIHandlerWeb.generate_path_web_id("MyServer", "sinusoid")
+        == "P1DPTVlTRVJWRVJcU0lOVVNPSUQ"
+    )
+
+
+def test_path_web_id_falls_back_to_search(
+    cache: SmartCache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    handler = PIHandlerWeb(
+        datasource="sourcename",
+        auth=None,
+        options={"path_web_ids": True},
+        url="https://piwebapi",
+        verify_ssl=True,
+        cache=cache,
+    )
+    path_web_id = PIHandlerWeb.generate_path_web_id("sourcename", "tag")
+    assert handler.tag_to_web_id("tag") == path_web_id
+    assert "tag" not in cache
+
+    requests_made = []
+
+    def fetch(url: str, params: Any = None, timeout: Optional[int] = None) -> Dict:
+        requests_made.append(url[len("https://piwebapi/") :])
+        if path_web_id in url:
+            response = requests.Response()
+            response.status_code = 404
+            raise requests.exceptions.HTTPError(response=response)
+        if url.endswith("dataservers"):
+            return {"Items": [{"Name": "sourcename", "WebId": "serverwebid"}]}
+        if url.endswith("search"):
+            return {"Items": [{"Name": "tag", "WebId": "searchedwebid"}]}
+        return {"Items": [{"Timestamp": "2020-04-01T09:05:00Z", "Value": 1.5}]}
+
+    monkeypatch.setattr(handler, "fetch", fetch)
+    df = handler.read_tag(
+        tag="tag",
+        start=ensure_datetime_with_tz(START_TIME),
+        end=ensure_datetime_with_tz(STOP_TIME),
+        sample_time=timedelta(seconds=SAMPLE_TIME),
+        read_type=ReaderType.INT,
+        metadata=None,
+    )
+    assert list(df["tag"]) == [1.5]
+    assert requests_made == [
+        f"streams/{path_web_id}/interpolated",
+        "dataservers",
+        "points/search",
+        "streams/searchedwebid/interpolated",
+    ]
+    assert handler.tag_to_web_id("tag") == "searchedwebid"
+
+
+@pytest.mark.parametrize("with_last_link", [True, False])  # type: ignore[misc]
+@pytest.mark.parametrize("server_page_size", [None, 4])  # type: ignore[misc]
+def test_search_fetches_all_pages(
+    pi_handler: PIHandlerWeb,
+    monkeypatch: pytest.MonkeyPatch,
+    with_last_link: bool,
+    server_page_size: Optional[int],
+) -> None:
+    pi_handler.datasource = None
+    pi_handler._search_page_size = 10
+    points = [{"Name": f"tag{i}", "Descriptor": f"desc{i}"} for i in range(25)]
+    starts = []
+
+    def fetch(url: str, params: Dict[str, Any], timeout: Optional[int] = None) -> Dict:
+        start, count = params["start"], params["count"]
+        # The server may return fewer items per page than requested
+        count = min(count, server_page_size or count)
+        starts.append(start)
+        links = {}
+        if start + count < len(points):
+            links["Next"] = f"{url}?query=name%3Atag%2A&start={start + count}"
+        if with_last_link:
+            last = (len(points) - 1) // count * count
+            links["Last"] = f"{url}?query=name%3Atag%2A&start={last}"
+        return {"Items": points[start : start + count], "Links": links}
+
+    monkeypatch.setattr(pi_handler, "fetch", fetch)
+    assert pi_handler.search("tag*") == [(f"tag{i}", f"desc{i}") for i in range(25)]
+    page_size = server_page_size or 10
+    assert sorted(starts) == list(range(0, 25, page_size))
+    assert list(pi_handler.iter_search("tag*", return_desc=False))[:2] == [
+        "tag0",
+        "tag1",
+    ]
+
+
+class FakeUpdatesServer:
+    """Issues a new marker for each retrieval, and returns the events
+    recorded on a stream since the marker was issued."""
+
+    def __init__(self) -> None:
+        self.events: Dict[str, List[Dict[str, Any]]] = {}
+        self.markers: Dict[str, Tuple[str, int]] = {}
+        self.issued = 0
+
+    def record(self, web_id: str, timestamp: str, value: float) -> None:
+        self.events.setdefault(web_id, []).append(
+            {"Timestamp": timestamp, "Value": value}
+        )
+
+    def _issue_marker(self, web_id: str) -> str:
+        marker = f"marker{self.issued}"
+        self.issued += 1
+        self.markers[marker] = (web_id, len(self.events.get(web_id, [])))
+        return marker
+
+    def post(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        assert url.endswith("streamsets/updates")
+        return {
+            "Items": [
+                {
+                    "Source": web_id,
+                    "Status": "Succeeded",
+                    "LatestMarker": self._issue_marker(web_id),
+                }
+                for web_id in params["webId"]
+            ]
+        }
+
+    def fetch(self, url: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        assert url.endswith("streamsets/updates")
+        items = []
+        for marker in params["marker"]:
+            if marker not in self.markers:
+                items.append({"RequestedMarker": marker, "Status": "Failed"})
+                continue
+            web_id, seen = self.markers.pop(marker)
+            items.append(
+                {
+                    "RequestedMarker": marker,
+                    "Status": "Succeeded",
+                    "Events": self.events.get(web_id, [])[seen:],
+                    "LatestMarker": self._issue_marker(web_id),
+                }
+            )
+        return {"Items": items}
+
+
+def test_stream_updates(
+    pi_handler: PIHandlerWeb, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    server = FakeUpdatesServer()
+    server.record("knownwebid", "2020-04-01T09:05:00Z", 1.0)
+    monkeypatch.setattr(pi_handler, "post", server.post)
+    monkeypatch.setattr(pi_handler, "fetch", server.fetch)
+
+    markers = pi_handler.register_updates(["alreadyknowntag"])
+    assert markers == {"alreadyknowntag": "marker0"}
+
+    server.record("knownwebid", "2020-04-01T09:06:00.5Z", 2.0)
+    server.record("knownwebid", "2020-04-01T09:07:00Z", 3.0)
+    frames, markers = pi_handler.get_updates(markers)
+    assert list(frames["alreadyknowntag"]["alreadyknowntag"]) == [2.0, 3.0]
+    assert str(frames["alreadyknowntag"].index[0]) == "2020-04-01 09:06:00.500000+00:00"
+
+    frames, markers = pi_handler.get_updates(markers)
+    assert frames["alreadyknowntag"].empty
+    assert markers == {"alreadyknowntag": "marker2"}
+
+    frames, markers = pi_handler.get_updates({"alreadyknowntag": "expired"})
+    assert frames == {}
+    assert markers == {}
+
+
+def normalize_stream_items(data: Dict[str, Any]) -> pd.DataFrame:
+    """Reference parser, flattening the items with pandas."""
+    df = pd.json_normalize(data=data, record_path="Items")
+    if "Value" not in df.columns:
+        if "Value.Name" in df.columns:
+            df.loc[df["Value.Name"] == "No Data", "Value.Value"] = np.nan
+        df = df.rename(columns=lambda c: c.replace("Value.", "", 1))
+    return df.filter(["Timestamp", "Value", "Good", "Questionable", "Substituted"])
+
+
+def status(good: bool) -> Dict[str, bool]:
+    return {"Good": good, "Questionable": False, "Substituted": False}
+
+
+STREAM_PAYLOADS = {
+    "interpolated": [
+        {"Timestamp": "2020-04-01T09:05:00Z", "Value": 1.5, **status(True)},
+        {"Timestamp": "2020-04-01T09:06:00Z", "Value": 2, **status(True)},
+    ],
+    "recorded_with_invalid": [
+        {"Timestamp": "2020-04-01T09:05:00.25Z", "Value": 1.5, **status(True)},
+        {
+            "Timestamp": "2020-04-01T09:05:30Z",
+            "Value": {"Name": "Bad Input", "Value": 307, "IsSystem": True},
+            **status(False),
+        },
+    ],
+    "summary": [
+        {
+            "Type": "Average",
+            "Value": {
+                "Timestamp": "2020-04-01T09:05:00Z",
+                "Value": 1.5,
+                **status(True),
+            },
+        },
+        {
+            "Type": "Average",
+            "Value": {
+                "Timestamp": "2020-04-01T09:06:00Z",
+                "Value": 2.5,
+                **status(True),
+            },
+        },
+    ],
+    "digital": [
+        {
+            "Timestamp": "2020-04-01T09:05:00Z",
+            "Value": {"Name": "Active", "Value": 1, "IsSystem": False},
+            **status(True),
+        },
+        {
+            "Timestamp": "2020-04-01T09:06:00Z",
+            "Value": {"Name": "No Data", "Value": 248, "IsSystem": True},
+            **status(False),
+        },
+    ],
+}
+
+
+@pytest.mark.parametrize("payload", list(STREAM_PAYLOADS))  # type: ignore[misc]
+def test_stream_items_to_frame_matches_normalize(payload: str) -> None:
+    items = STREAM_PAYLOADS[payload]
+    pd.testing.assert_frame_equal(
+        PIHandlerWeb._stream_items_to_frame(items, summary=payload == "summary"),
+        normalize_stream_items({"Items": items}),
+    )
+
+
+def test_read_tag_summaries(
+    pi_handler: PIHandlerWeb, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    requests_made = []
+
+    def fetch(url: str, params: Dict[str, Any], timeout: Optional[int] = None) -> Dict:
+        requests_made.append((url, params))
+        return {
+            "Items": [
+                {"Type": summary_type, "Value": {"Timestamp": timestamp, "Value": v}}
+                for summary_type, v in [("Minimum", 1.0), ("StdDev", 2.0)]
+                for timestamp in ["2020-04-01T09:05:00Z", "2020-04-01T09:06:00Z"]
+            ]
+        }
+
+    monkeypatch.setattr(pi_handler, "fetch", fetch)
+    frames = pi_handler.read_tag_summaries(
+        tag="alreadyknowntag",
+        start=ensure_datetime_with_tz(START_TIME),
+        end=ensure_datetime_with_tz(STOP_TIME),
+        sample_time=timedelta(seconds=SAMPLE_TIME),
+        read_types=[ReaderType.MIN, ReaderType.STD, ReaderType.VAR],
+    )
+    assert len(requests_made) == 1
+    url, params = requests_made[0]
+    assert url.endswith("streams/knownwebid/summary")
+    assert params["summaryType"] == ["Minimum", "StdDev"]
+    assert params["selectedFields"].startswith("Links;Items.Type;")
+    assert frames[ReaderType.MIN]["alreadyknowntag"].tolist() == [1.0, 1.0]
+    assert frames[ReaderType.STD]["alreadyknowntag"].tolist() == [2.0, 2.0]
+    assert frames[ReaderType.VAR]["alreadyknowntag"].tolist() == [4.0, 4.0]
+
+
+def test_read_tag_summaries_event_counts(
+    pi_handler: PIHandlerWeb, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    requests_made = []
+
+    def fetch(url: str, params: Dict[str, Any], timeout: Optional[int] = None) -> Dict:
+        requests_made.append((url, params))
+        values = {"Count": [8.0, 0.0], "PercentGood": [80.0, 0.0], "Total": [5.0, 6.0]}
+        return {
+            "Items": [
+                {"Type": summary_type, "Value": {"Timestamp": timestamp, "Value": v}}
+                for summary_type in params["summaryType"]
+                for timestamp, v in zip(
+                    ["2020-04-01T09:05:00Z", "2020-04-01T09:06:00Z"],
+                    values[summary_type],
+                )
+            ]
+        }
+
+    monkeypatch.setattr(pi_handler, "fetch", fetch)
+    frames = pi_handler.read_tag_summaries(
+        tag="alreadyknowntag",
+        start=ensure_datetime_with_tz(START_TIME),
+        end=ensure_datetime_with_tz(STOP_TIME),
+        sample_time=timedelta(seconds=SAMPLE_TIME),
+        read_types=[
+            ReaderType.COUNT,
+            ReaderType.TOTAL,
+            ReaderType.GOOD,
+            ReaderType.BAD,
+        ],
+    )
+    # Event weighted and time weighted summaries need separate requests
+    assert [params["summaryType"] for _, params in requests_made] == [
+        ["Count", "PercentGood"],
+        ["Total"],
+    ]
+    assert requests_made[0][1]["calculationBasis"] == "EventWeighted"
+    assert "calculationBasis" not in requests_made[1][1]
+    assert list(frames) == [
+        ReaderType.COUNT,
+        ReaderType.TOTAL,
+        ReaderType.GOOD,
+        ReaderType.BAD,
+    ]
+    tag = "alreadyknowntag"
+    assert frames[ReaderType.GOOD][tag].tolist() == [8.0, 0.0]
+    assert frames[ReaderType.COUNT][tag].tolist()[0] == 10.0
+    assert frames[ReaderType.BAD][tag].tolist()[0] == 2.0
+    # The number of events is unknown when none of them are good
+    assert frames[ReaderType.BAD][tag].isna().tolist() == [False, True]
+    assert frames[ReaderType.TOTAL][tag].tolist() == [5.0, 6.0]
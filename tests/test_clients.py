@@ -1,11 +1,31 @@
-from datetime import datetime, timedelta
+import asyncio
+import os
+import pickle
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
+import numpy as np
 import pandas as pd
 import pytest
+import requests
 
-from tagreader.clients import IMSClient, get_missing_intervals, get_next_timeslice
+from tagreader.cache import SmartCache
+from tagreader.clients import (
+    AsyncIMSClient,
+    IMSClient,
+    ReadPlan,
+    assemble_on_grid,
+    frame_from_shared_memory,
+    frame_to_shared_memory,
+    get_missing_intervals,
+    get_next_timeslice,
+    get_time_shards,
+)
 from tagreader.utils import IMSType, ReaderType
+from tagreader.web_handlers import AdaptivePageSize, get_adaptive_page_size
 
 
 def test_init_client_without_cache() -> None:
@@ -111,3 +131,682 @@ def test_get_missing_intervals() -> None:
         datetime(2018, 1, 18, 5, 10, 0),
         datetime(2018, 1, 18, 6, 0, 0),
     )
+
+
+class FakeHandler:
+    """Handler stand-in returning one value per ts step, without any network."""
+
+    _max_rows = 10000
+    _bytes_per_row = 50
+
+    def __init__(self) -> None:
+        self.calls: List[Tuple[str, datetime, datetime]] = []
+
+    def _get_tag_metadata(self, tag: str) -> Dict[str, str]:
+        return {}
+
+    def read_tag(
+        self,
+        tag: str,
+        start: datetime,
+        end: datetime,
+        sample_time: timedelta,
+        read_type: ReaderType,
+        metadata: Optional[Dict[str, str]],
+        get_status: bool = False,
+    ) -> pd.DataFrame:
+        self.calls.append((tag, start, end))
+        index = pd.date_range(start=start, end=end, freq=sample_time, name="time")
+        index = index[: self._max_rows]
+        return pd.DataFrame({tag: np.arange(len(index), dtype=float)}, index=index)
+
+
+class MultiTagFakeHandler(FakeHandler):
+    """Handler stand-in reading several tags per request."""
+
+    _multi_tag_reads = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: List[List[str]] = []
+
+    def read_tags(self, tags: List[str], **kwargs: Any) -> Dict[str, pd.DataFrame]:
+        self.batches.append(tags)
+        return {
+            tag: FakeHandler.read_tag(self, tag=tag, metadata=None, **kwargs)
+            for tag in tags
+        }
+
+
+@pytest.fixture  # type: ignore[misc]
+def fake_client() -> IMSClient:
+    client = IMSClient(datasource="mock", imstype=IMSType.PIWEBAPI, cache=None)
+    client.handler = FakeHandler()
+    return client
+
+
+def test_concurrent_read_matches_sequential_read(fake_client: IMSClient) -> None:
+    tags = [f"tag{i}" for i in range(20)] + ["tag3"]
+    sequential = fake_client.read(
+        tags, "2020-01-01 00:00:00", "2020-01-01 01:00:00", ts=60
+    )
+    concurrent = fake_client.read(
+        tags, "2020-01-01 00:00:00", "2020-01-01 01:00:00", ts=60, max_workers=8
+    )
+    assert list(concurrent.columns) == [f"tag{i}" for i in range(20)]
+    pd.testing.assert_frame_equal(sequential, concurrent)
+
+
+def test_async_read_matches_sync_read(fake_client: IMSClient) -> None:
+    async_client = AsyncIMSClient(
+        datasource="mock", imstype=IMSType.PIWEBAPI, cache=None, max_concurrency=4
+    )
+    async_client.client.handler = FakeHandler()
+    tags = [f"tag{i}" for i in range(10)]
+    expected = fake_client.read(
+        tags, "2020-01-01 00:00:00", "2020-01-01 01:00:00", ts=60
+    )
+    result = asyncio.run(
+        async_client.read(tags, "2020-01-01 00:00:00", "2020-01-01 01:00:00", ts=60)
+    )
+    pd.testing.assert_frame_equal(expected, result, check_freq=False)
+
+
+def test_iter_read_yields_pages_without_overlap(fake_client: IMSClient) -> None:
+    fake_client.handler._max_rows = 20
+    start, end = "2020-01-01 00:00:00", "2020-01-01 01:00:00"
+    chunks = list(fake_client.iter_read(["tag1", "tag2"], start, end, ts=60))
+    assert [tag for tag, _ in chunks] == ["tag1"] * 4 + ["tag2"] * 4
+    assert all(len(df) <= 20 for _, df in chunks)
+
+    tag1 = pd.concat([df for tag, df in chunks if tag == "tag1"])
+    assert tag1.index.is_unique
+    expected = fake_client.read(["tag1"], start, end, ts=60)
+    pd.testing.assert_index_equal(tag1.index, expected.index)
+
+
+def test_get_time_shards() -> None:
+    start = datetime(2020, 1, 1, 0, 0, 0)
+    end = datetime(2020, 1, 1, 1, 0, 0)
+    shards = get_time_shards(
+        start=start, end=end, ts=timedelta(seconds=60), max_steps=25
+    )
+    assert shards == [
+        (start, datetime(2020, 1, 1, 0, 25, 0)),
+        (datetime(2020, 1, 1, 0, 25, 0), datetime(2020, 1, 1, 0, 50, 0)),
+        (datetime(2020, 1, 1, 0, 50, 0), end),
+    ]
+
+
+def test_sharded_read_matches_sequential_read(fake_client: IMSClient) -> None:
+    fake_client.handler._max_rows = 10
+    start, end = "2020-01-01 00:00:00", "2020-01-01 01:00:00"
+    sequential = fake_client.read(["tag1"], start, end, ts=60)
+    fake_client.handler.calls.clear()
+    sharded = fake_client.read(["tag1"], start, end, ts=60, shard_workers=4)
+    pd.testing.assert_index_equal(sequential.index, sharded.index)
+    # One request per shard of 9 intervals, and no requests following up a shard
+    assert len(fake_client.handler.calls) == 7
+
+
+def test_plan_read_without_cache(fake_client: IMSClient) -> None:
+    fake_client.handler._max_rows = 10
+    plan = fake_client.plan_read(
+        ["tag1", "tag2"], "2020-01-01 00:00:00", "2020-01-01 01:00:00", ts=60
+    )
+    assert fake_client.handler.calls == []
+    assert list(plan.index) == ["tag1", "tag2"]
+    assert plan.loc["tag1", "requests"] == 7
+    assert plan.loc["tag1", "rows"] == 61
+    assert plan.loc["tag1", "bytes"] == 61 * 50
+    assert plan.loc["tag1", "cached_rows"] == 0
+    assert len(plan.loc["tag1", "missing_intervals"]) == 1
+
+
+def test_plan_read_with_cache(fake_client: IMSClient, cache: SmartCache) -> None:
+    fake_client.cache = cache
+    start, end = "2020-01-01 00:00:00", "2020-01-01 01:00:00"
+    fake_client.read(["tag1"], start, "2020-01-01 00:30:00", ts=60)
+    plan = fake_client.plan_read(["tag1", "tag2"], start, end, ts=60)
+    assert plan.loc["tag1", "cached_rows"] == 31
+    assert plan.loc["tag1", "rows"] == 30
+    assert plan.loc["tag2", "cached_rows"] == 0
+    assert plan.loc["tag2", "rows"] == 61
+
+
+def test_identical_concurrent_reads_are_coalesced(fake_client: IMSClient) -> None:
+    release = threading.Event()
+    read_tag = fake_client.handler.read_tag
+
+    def slow_read_tag(*args: Any, **kwargs: Any) -> pd.DataFrame:
+        release.wait(timeout=10)
+        return read_tag(*args, **kwargs)
+
+    fake_client.handler.read_tag = slow_read_tag
+    start, end = "2020-01-01 00:00:00", "2020-01-01 01:00:00"
+    results: List[pd.DataFrame] = []
+
+    def read() -> None:
+        results.append(fake_client.read(["tag1"], start, end, ts=60))
+
+    threads = [threading.Thread(target=read) for _ in range(3)]
+    threads[0].start()
+    while not fake_client._single_flight._in_flight:
+        time.sleep(0.001)
+    for thread in threads[1:]:
+        thread.start()
+    while fake_client.coalesced_reads < 2:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(fake_client.handler.calls) == 1
+    assert fake_client.coalesced_reads == 2
+    pd.testing.assert_frame_equal(results[0], results[1])
+    pd.testing.assert_frame_equal(results[0], results[2])
+
+
+def test_adaptive_page_size() -> None:
+    page_size = AdaptivePageSize(
+        initial=1000, minimum=100, maximum=4000, target_seconds=10, max_bytes=10**6
+    )
+    page_size.update(rows=1000, max_rows=1000, seconds=1, nbytes=1000)
+    assert page_size.get() == 2000
+    page_size.update(rows=10, max_rows=2000, seconds=1, nbytes=1000)
+    assert page_size.get() == 2000  # Partial page says nothing about capacity
+    page_size.update(rows=2000, max_rows=2000, seconds=1, nbytes=1000)
+    page_size.update(rows=4000, max_rows=4000, seconds=1, nbytes=1000)
+    assert page_size.get() == 4000
+    page_size.update(rows=4000, max_rows=4000, seconds=20, nbytes=1000)
+    assert page_size.get() == 2000
+    page_size.update(rows=2000, max_rows=2000, seconds=1, nbytes=10**7)
+    assert page_size.get() == 1000
+    while page_size.shrink():
+        pass
+    assert page_size.get() == 100
+
+
+def test_adaptive_page_size_applies_options_of_later_handlers() -> None:
+    options = {"min_rows": 200, "max_rows_limit": 5000, "target_page_seconds": 5}
+    first = get_adaptive_page_size(
+        url="https://shared", datasource=None, options={}, initial=8000, maximum=8000
+    )
+    later = get_adaptive_page_size(
+        url="https://shared",
+        datasource=None,
+        options=options,
+        initial=1000,
+        maximum=8000,
+    )
+    # The tuned size is shared, and kept within the limits of the later options
+    assert later is first
+    assert later.get() == 5000
+    assert (later.minimum, later.maximum, later.target_seconds) == (200, 5000, 5)
+    assert later.timeout_seconds == 15
+    with pytest.raises(ValueError):
+        get_adaptive_page_size(
+            url="https://shared",
+            datasource=None,
+            options={"min_rows": 6000},
+            initial=1000,
+            maximum=5000,
+        )
+
+
+def test_adaptive_paging_grows_time_windows(fake_client: IMSClient) -> None:
+    class AdaptiveFakeHandler(FakeHandler):
+        last_response_bytes = 0
+
+        def read_tag(self, *args: Any, max_rows: int = 0, **kwargs: Any) -> pd.DataFrame:  # type: ignore[override]
+            return super().read_tag(*args, **kwargs)
+
+    handler = AdaptiveFakeHandler()
+    handler.page_size = AdaptivePageSize(  # type: ignore[attr-defined]
+        initial=10, minimum=10, maximum=1000, target_seconds=10, max_bytes=10**6
+    )
+    fake_client.handler = handler
+    start, end = "2020-01-01 00:00:00", "2020-01-02 00:00:00"
+    df = fake_client.read(["tag1"], start, end, ts=60)
+    assert len(df) == 1441
+    assert df.index.is_unique
+    windows = [(e - s) / timedelta(seconds=60) for _, s, e in handler.calls]
+    assert windows[:4] == [9, 19, 39, 79]
+    assert handler.page_size.get() == 1000  # type: ignore[attr-defined]
+
+
+def test_assemble_on_grid_matches_concat() -> None:
+    tz = ZoneInfo("Europe/Oslo")
+    start = datetime(2020, 1, 1, tzinfo=tz)
+    end = datetime(2020, 1, 1, 1, tzinfo=tz)
+    index = pd.date_range(start, end, freq="60s", name="time")
+    frames = [
+        pd.DataFrame({"tag1": np.arange(61.0)}, index=index),
+        pd.DataFrame({"tag2": np.arange(30.0)}, index=index[10:40]),
+        pd.DataFrame({"tag3": np.arange(5.0)}, index=index[::15]),
+    ]
+    expected = pd.concat(frames[1:], axis=1, sort=True)
+    df = assemble_on_grid(frames[1:], start, end, timedelta(seconds=60), tz)
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+    expected = pd.concat(frames, axis=1, sort=True)
+    df = assemble_on_grid(frames, start, end, timedelta(seconds=60), tz)
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+
+    # Counts without gaps keep their integer dtype
+    counts = [
+        pd.DataFrame({"tag4": np.arange(61)}, index=index),
+        pd.DataFrame({"tag5": np.arange(60)}, index=index[1:]),
+        pd.DataFrame({"tag6": np.arange(61.0), "tag7": np.arange(61)}, index=index),
+    ]
+    expected = pd.concat(counts, axis=1, sort=True)
+    df = assemble_on_grid(counts, start, end, timedelta(seconds=60), tz)
+    pd.testing.assert_frame_equal(df, expected, check_freq=False)
+    assert df["tag4"].dtype == df["tag7"].dtype == np.int64
+
+
+def test_assemble_on_grid_rejects_unaligned_data() -> None:
+    tz = ZoneInfo("Europe/Oslo")
+    start = datetime(2020, 1, 1, tzinfo=tz)
+    end = datetime(2020, 1, 1, 1, tzinfo=tz)
+    index = pd.date_range(start, end, freq="60s", name="time")
+    aligned = pd.DataFrame({"tag1": np.arange(61.0)}, index=index)
+    shifted = pd.DataFrame(
+        {"tag2": np.arange(61.0)}, index=index + timedelta(seconds=1)
+    )
+    text = pd.DataFrame({"tag3": ["a"] * 61}, index=index)
+    ts = timedelta(seconds=60)
+    assert assemble_on_grid([aligned, shifted], start, end, ts, tz) is None
+    assert assemble_on_grid([aligned, text], start, end, ts, tz) is None
+
+
+def test_frame_shared_memory_round_trip() -> None:
+    tz = ZoneInfo("Europe/Oslo")
+    index = pd.date_range("2020-01-01", periods=5, freq="60s", tz=tz, name="time")
+    df = pd.DataFrame(
+        {"tag1": [1.0, np.nan, 3.0, 4.0, 5.0], "tag1::status": [0, 1, 2, 4, 0]},
+        index=index,
+    )
+    description = frame_to_shared_memory(df)
+    assert "frame" not in description
+    result = frame_from_shared_memory(pickle.loads(pickle.dumps(description)), tz)
+    pd.testing.assert_frame_equal(result, df, check_freq=False, check_index_type=False)
+
+    text = pd.DataFrame({"tag1": ["a", "b"]}, index=index[:2])
+    pd.testing.assert_frame_equal(
+        frame_from_shared_memory(frame_to_shared_memory(text), tz), text
+    )
+
+
+def test_frame_shared_memory_is_not_used_on_windows(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    index = pd.date_range("2020-01-01", periods=5, freq="60s", tz="UTC")
+    df = pd.DataFrame({"tag1": np.arange(5.0)}, index=index)
+    with monkeypatch.context() as m:
+        # Blocks are destroyed when the worker closes its only handle
+        m.setattr(os, "name", "nt")
+        description = frame_to_shared_memory(df)
+    assert "name" not in description
+    pd.testing.assert_frame_equal(
+        frame_from_shared_memory(pickle.loads(pickle.dumps(description)), timezone.utc),
+        df,
+    )
+
+
+def test_read_plan_is_picklable(fake_client: IMSClient, cache: SmartCache) -> None:
+    plan = ReadPlan(
+        datasource="mock",
+        imstype=IMSType.PIWEBAPI,
+        tz=ZoneInfo("Europe/Oslo"),
+        url=None,
+        handler_options={},
+        verify_ssl=True,
+        auth=None,
+        cache_type=type(cache),
+        cache_directory=cache.directory,
+        tags=["tag1", "tag2"],
+        start=datetime(2020, 1, 1),
+        end=datetime(2020, 1, 2),
+        ts=timedelta(seconds=60),
+        read_type=ReaderType.INT,
+        get_status=False,
+    )
+    copy = pickle.loads(pickle.dumps(plan))
+    assert copy.tags == plan.tags
+    assert copy.cache_type is SmartCache
+
+
+def test_multi_tag_reads_share_requests(fake_client: IMSClient) -> None:
+    start, end = "2020-01-01 00:00:00", "2020-01-01 01:00:00"
+    expected = fake_client.read(["tag1", "tag2", "tag3"], start, end, ts=60)
+    fake_client.handler = MultiTagFakeHandler()
+    fake_client.handler._max_rows = 31
+    df = fake_client.read(["tag1", "tag2", "tag3"], start, end, ts=60)
+    assert fake_client.handler.batches == [["tag1", "tag2", "tag3"]] * 2
+    pd.testing.assert_index_equal(df.index, expected.index)
+    assert list(df.columns) == ["tag1", "tag2", "tag3"]
+
+
+def test_subscription_polls_updates_without_caching(
+    fake_client: IMSClient, cache: SmartCache
+) -> None:
+    class UpdatesFakeHandler(FakeHandler):
+        def __init__(self) -> None:
+            super().__init__()
+            self.pending = {"tag1": [1.0, 2.0], "tag2": [3.0]}
+            # A late event, recorded long before it is delivered
+            self.start = datetime.now(timezone.utc) - timedelta(hours=1)
+            self.registrations: List[List[str]] = []
+
+        def register_updates(self, tags: List[str]) -> Dict[str, str]:
+            self.registrations.append(tags)
+            return {tag: "marker" for tag in tags}
+
+        def get_updates(
+            self, markers: Dict[str, str], get_status: bool = False
+        ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+            frames = {}
+            for tag in markers:
+                index = pd.date_range(
+                    self.start, periods=len(self.pending[tag]), freq="s"
+                )
+                frames[tag] = pd.DataFrame({tag: self.pending[tag]}, index=index)
+                self.pending[tag] = []
+            # The marker of tag2 has expired
+            return frames, {"tag1": "marker"}
+
+    fake_client.handler = UpdatesFakeHandler()
+    fake_client.cache = cache
+    subscription = fake_client.subscribe(["tag1", "tag2"])
+    df = subscription.poll()
+    assert list(df.columns) == ["tag1", "tag2"]
+    assert df["tag1"].tolist() == [1.0, 2.0]
+    assert fake_client.handler.registrations == [["tag1", "tag2"], ["tag2"]]
+    assert subscription.poll().empty
+
+    # Polls record no coverage, so RAW reads of the period go to the server
+    assert len(cache) == 0
+    now = datetime.now(timezone.utc)
+    fake_client.read(
+        ["tag1"], now - timedelta(seconds=50), now, read_type=ReaderType.RAW
+    )
+    assert len(fake_client.handler.calls) == 1
+
+
+def test_read_multi_fetches_summaries_together(
+    fake_client: IMSClient, cache: SmartCache
+) -> None:
+    class SummaryFakeHandler(FakeHandler):
+        summary_calls: List[List[ReaderType]] = []
+
+        @staticmethod
+        def _is_summary(read_type: ReaderType) -> bool:
+            return read_type in [ReaderType.MIN, ReaderType.MAX, ReaderType.AVG]
+
+        def read_tag_summaries(
+            self, tag: str, read_types: List[ReaderType], **kwargs: Any
+        ) -> Dict[ReaderType, pd.DataFrame]:
+            self.summary_calls.append(read_types)
+            df = FakeHandler.read_tag(
+                self, tag=tag, read_type=read_types[0], metadata=None, **kwargs
+            )
+            return {read_type: df * (i + 1) for i, read_type in enumerate(read_types)}
+
+    fake_client.handler = SummaryFakeHandler()
+    fake_client.cache = cache
+    start, end = "2020-01-01 00:00:00", "2020-01-01 01:00:00"
+    df = fake_client.read_multi(
+        ["tag1", "tag2"], start, end, ts=60, read_types=["MIN", "MAX", "INT"]
+    )
+    assert list(df.columns) == [
+        ("tag1", "MIN"),
+        ("tag1", "MAX"),
+        ("tag1", "INT"),
+        ("tag2", "MIN"),
+        ("tag2", "MAX"),
+        ("tag2", "INT"),
+    ]
+    assert fake_client.handler.summary_calls == [[ReaderType.MIN, ReaderType.MAX]] * 2
+    assert df[("tag1", "MAX")].tolist() == (2 * df[("tag1", "MIN")]).tolist()
+    # INT is not a summary type, and is read on its own
+    assert [call[0] for call in fake_client.handler.calls] == [
+        "tag1",
+        "tag1",
+        "tag2",
+        "tag2",
+    ]
+
+    # Each read type is cached separately
+    fake_client.handler.summary_calls.clear()
+    pd.testing.assert_series_equal(
+        fake_client.read(["tag1"], start, end, ts=60, read_type=ReaderType.MAX)["tag1"],
+        df[("tag1", "MAX")].rename("tag1"),
+        check_freq=False,
+    )
+    assert fake_client.handler.summary_calls == []
+
+
+def test_read_snapshot_of_multiple_tags(fake_client: IMSClient) -> None:
+    class SnapshotFakeHandler(FakeHandler):
+        def read_tags(
+            self, tags: List[str], get_status: bool, **kwargs: Any
+        ) -> Dict[str, pd.DataFrame]:
+            self.calls.append((",".join(tags), kwargs["start"], kwargs["end"]))
+            index = pd.DatetimeIndex(["2020-01-01 12:00:00"], tz="UTC", name="time")
+            return {
+                "tag1": pd.DataFrame(
+                    {"tag1": [1.5], "tag1::status": [1]},
+                    index=index,
+                ),
+                "tag2": pd.DataFrame(),
+            }
+
+    fake_client.handler = SnapshotFakeHandler()
+    with pytest.raises(RuntimeError, match="read_snapshots"):
+        fake_client.read(["tag1", "tag2"], read_type=ReaderType.SNAPSHOT)
+    df = fake_client.read_snapshots(["tag1", "tag2"], get_status=True)
+    assert len(fake_client.handler.calls) == 1
+    assert list(df.index) == ["tag1", "tag2"]
+    assert list(df.columns) == ["time", "value", "status"]
+    assert df.loc["tag1", "time"] == pd.Timestamp(
+        "2020-01-01 13:00:00", tz=fake_client.tz
+    )
+    assert df.loc["tag1", "value"] == 1.5
+    assert df.loc["tag1", "status"] == 1
+    assert pd.isna(df.loc["tag2", "value"])
+
+    # The layout does not depend on the number of tags
+    df = fake_client.read_snapshots("tag1")
+    assert list(df.index) == ["tag1"]
+    assert list(df.columns) == ["time", "value"]
+
+
+def test_shape_preserving_read_is_not_cached_or_paged(
+    fake_client: IMSClient, cache: SmartCache
+) -> None:
+    fake_client.cache = cache
+    pixel_budgets = []
+
+    def read_tag(pixels: Optional[int] = None, **kwargs: Any) -> pd.DataFrame:
+        assert "max_rows" not in kwargs
+        pixel_budgets.append(pixels)
+        return FakeHandler.read_tag(fake_client.handler, **kwargs)
+
+    fake_client.handler.read_tag = read_tag  # type: ignore[method-assign]
+    start, end = "2020-01-01 00:00:00", "2020-01-02 00:00:00"
+    for _ in range(2):
+        fake_client.read(
+            ["tag1"],
+            start,
+            end,
+            ts=60,
+            read_type=ReaderType.SHAPEPRESERVING,
+            pixels=800,
+        )
+    fake_client.read(["tag1"], start, end, read_type=ReaderType.SHAPEPRESERVING)
+    # ts is ignored, and can be left out
+    fake_client.read(
+        ["tag1"], start, end, ts=None, read_type=ReaderType.SHAPEPRESERVING
+    )
+    assert pixel_budgets == [800, 800, 1000, 1000]
+    assert len(cache) == 0
+
+
+def test_paged_read_does_not_reread_last_row(fake_client: IMSClient) -> None:
+    fake_client.handler._max_rows = 20
+    df = fake_client.read(["tag1"], "2020-01-01 00:00:00", "2020-01-01 01:00:00", ts=60)
+    assert len(df) == 61
+    starts = [start for _, start, _ in fake_client.handler.calls]
+    # Each page starts one step after the last row of the previous page
+    assert [start.minute for start in starts] == [0, 20, 40, 0]
+
+
+def test_async_client_is_reusable_across_event_loops() -> None:
+    async_client = AsyncIMSClient(
+        datasource="mock", imstype=IMSType.PIWEBAPI, cache=None, max_concurrency=64
+    )
+    handler = FakeHandler()
+    in_flight = [0]
+    most_in_flight = [0]
+    lock = threading.Lock()
+    read_tag = handler.read_tag
+
+    def slow_read_tag(**kwargs: Any) -> pd.DataFrame:
+        with lock:
+            in_flight[0] += 1
+            most_in_flight[0] = max(most_in_flight[0], in_flight[0])
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        return read_tag(**kwargs)
+
+    handler.read_tag = slow_read_tag  # type: ignore[method-assign]
+    async_client.client.handler = handler
+    tags = [f"tag{i}" for i in range(100)]
+    for _ in range(2):
+        # More tags than workers, so calls wait for a free worker
+        result = asyncio.run(
+            async_client.read(tags, "2020-01-01 00:00:00", "2020-01-01 00:10:00")
+        )
+        assert list(result.columns) == tags
+    async_client.close()
+    # More calls in flight than the default executor allows on small machines
+    assert 32 < most_in_flight[0] <= 64
+
+
+def test_async_read_uses_multi_tag_reads() -> None:
+    async_client = AsyncIMSClient(
+        datasource="mock", imstype=IMSType.PIWEBAPI, cache=None
+    )
+    handler = MultiTagFakeHandler()
+    async_client.client.handler = handler
+    tags = ["tag1", "tag2", "tag3"]
+    result = asyncio.run(
+        async_client.read(tags, "2020-01-01 00:00:00", "2020-01-01 01:00:00", ts=60)
+    )
+    assert list(result.columns) == tags
+    assert len(handler.batches) == 1
+
+
+def test_async_client_looks_up_tags_at_once() -> None:
+    class SearchingFakeHandler(FakeHandler):
+        def __init__(self) -> None:
+            super().__init__()
+            self.lookups: List[List[str]] = []
+
+        def tags_to_web_ids(self, tags: List[str]) -> Dict[str, Optional[str]]:
+            self.lookups.append(tags)
+            return {tag: f"webid_{tag}" for tag in tags}
+
+        def _get_tag_unit(self, tag: str) -> str:
+            return "unit"
+
+        def _get_tag_description(self, tag: str) -> str:
+            return "description"
+
+    async_client = AsyncIMSClient(
+        datasource="mock", imstype=IMSType.PIWEBAPI, cache=None
+    )
+    handler = SearchingFakeHandler()
+    async_client.client.handler = handler
+    tags = ["tag1", "tag2", "tag3"]
+
+    async def main() -> None:
+        await async_client.read(tags, "2020-01-01 00:00:00", "2020-01-01 01:00:00")
+        assert await async_client.get_units(tags) == dict.fromkeys(tags, "unit")
+        assert await async_client.get_descriptions(tags) == dict.fromkeys(
+            tags, "description"
+        )
+
+    asyncio.run(main())
+    assert handler.lookups == [tags] * 3
+
+
+def test_adaptive_paging_shrinks_on_server_timeouts(fake_client: IMSClient) -> None:
+    class OverloadedFakeHandler(FakeHandler):
+        last_response_bytes = 0
+
+        def read_tag(self, *args: Any, max_rows: int = 0, **kwargs: Any) -> pd.DataFrame:  # type: ignore[override]
+            if max_rows > 100:
+                response = requests.Response()
+                response.status_code = 504
+                raise requests.exceptions.HTTPError(response=response)
+            return super().read_tag(*args, **kwargs)
+
+    handler = OverloadedFakeHandler()
+    handler.page_size = AdaptivePageSize(  # type: ignore[attr-defined]
+        initial=800, minimum=50, maximum=1000, target_seconds=10, max_bytes=10**6
+    )
+    fake_client.handler = handler
+    df = fake_client.read(["tag1"], "2020-01-01 00:00:00", "2020-01-01 06:00:00")
+    assert len(df) == 361
+    assert handler.page_size.get() == 100  # type: ignore[attr-defined]
+
+    # Errors that a smaller page does not fix are raised
+    def not_found(*args: Any, **kwargs: Any) -> pd.DataFrame:
+        response = requests.Response()
+        response.status_code = 404
+        raise requests.exceptions.HTTPError(response=response)
+
+    handler.read_tag = not_found  # type: ignore[method-assign]
+    with pytest.raises(requests.exceptions.HTTPError):
+        fake_client.read(["tag2"], "2020-01-01 00:00:00", "2020-01-01 06:00:00")
+
+
+def read_plan_with_fake_handler(plan: ReadPlan) -> pd.DataFrame:
+    if "broken" in plan.tags:
+        raise RuntimeError("Read failed")
+    client = IMSClient(datasource="mock", imstype=IMSType.PIWEBAPI, tz=plan.tz)
+    client.handler = FakeHandler()
+    return client.read(plan.tags, plan.start, plan.end, ts=plan.ts)
+
+
+def shared_memory_blocks() -> List[str]:
+    return [name for name in os.listdir("/dev/shm") if name.startswith("psm_")]
+
+
+@pytest.mark.skipif(  # type: ignore[misc]
+    not os.path.isdir("/dev/shm"), reason="Needs POSIX shared memory"
+)
+def test_read_in_processes(
+    fake_client: IMSClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Worker processes are forked, so they see the patched method
+    monkeypatch.setattr(ReadPlan, "read", read_plan_with_fake_handler)
+    fake_client.handler.datasource = "mock"  # type: ignore[attr-defined]
+    fake_client.handler.base_url = None  # type: ignore[attr-defined]
+    start, end = "2020-01-01 00:00:00", "2020-01-01 01:00:00"
+    tags = [f"tag{i}" for i in range(5)]
+    blocks = shared_memory_blocks()
+
+    expected = fake_client.read(tags, start, end, ts=60)
+    df = fake_client.read(tags, start, end, ts=60, max_processes=2)
+    pd.testing.assert_frame_equal(
+        df, expected, check_freq=False, check_index_type=False
+    )
+    assert shared_memory_blocks() == blocks
+
+    # Blocks from the plans that succeeded are released when another fails
+    with pytest.raises(RuntimeError, match="Read failed"):
+        fake_client.read(tags + ["broken"], start, end, ts=60, max_processes=3)
+    assert shared_memory_blocks() == blocks
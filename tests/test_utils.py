@@ -3,10 +3,16 @@ import os
 from typing import Optional
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
+import pandas as pd
 import pytest
 
 import tagreader.utils as utils
-from tagreader.utils import ensure_datetime_with_tz, is_equinor, urljoin
+from tagreader.utils import (
+    ensure_datetime_with_tz,
+    is_equinor,
+    parse_utc_timestamps,
+    urljoin,
+)
 
 is_GITHUBACTION = "GITHUB_ACTION" in os.environ
 is_AZUREPIPELINE = "TF_BUILD" in os.environ
@@ -119,3 +125,22 @@ def test_equinor() -> None:
         assert is_equinor() is False
     else:
         assert is_equinor() is True
+
+
+def test_parse_utc_timestamps() -> None:
+    index = parse_utc_timestamps(
+        [
+            "2020-04-01T09:05:00Z",
+            "2020-04-01T09:05:00.25Z",
+            "2020-04-01T09:05:01.1234567Z",
+        ]
+    )
+    assert list(index) == [
+        pd.Timestamp("2020-04-01 09:05:00", tz="UTC"),
+        pd.Timestamp("2020-04-01 09:05:00.25", tz="UTC"),
+        pd.Timestamp("2020-04-01 09:05:01.1234567", tz="UTC"),
+    ]
+
+    # Timestamps with offsets fall back to pandas
+    index = parse_utc_timestamps(["2020-04-01T11:05:00+02:00"])
+    assert list(index) == [pd.Timestamp("2020-04-01 09:05:00", tz="UTC")]